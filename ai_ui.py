@@ -1,96 +1,195 @@
 import pygame
+import queue
 from settings import *
+from fonts import Fonts
+
+
+class TextLayout:
+    """
+    Word-wraps text as it is revealed.
+
+    Finished lines are rendered once and cached; only the line that is
+    still being typed gets re-rendered, and only when it changes.
+    """
+
+    def __init__(self, font, max_width, color):
+        self.font = font
+        self.max_width = max_width
+        self.color = color
+        self.reset("")
+
+    def reset(self, text):
+        self.text = text
+        self.cursor = 0         # chars of `text` consumed into words
+        self.lines = []         # rendered surfaces of finished lines
+        self.current_line = ""  # words placed on the line being typed
+        self.live_key = None
+        self.live_surfaces = []
+
+    def _finish_line(self):
+        self.lines.append(self.font.render(self.current_line, True, self.color))
+        self.current_line = ""
+
+    def _place_word(self, word):
+        test_line = self.current_line + word + " "
+        fw, _ = self.font.size(test_line)
+
+        if fw < self.max_width:
+            self.current_line = test_line
+        else:
+            self._finish_line()
+            self.current_line = word + " "
+
+    def advance(self, revealed):
+        """Lay out every complete word within the first `revealed` chars."""
+        text = self.text
+        done = revealed >= len(text)
+
+        while self.cursor < revealed:
+            space = text.find(" ", self.cursor, revealed)
+            newline = text.find("\n", self.cursor, revealed)
+            ends = [i for i in (space, newline) if i != -1]
+
+            if not ends:
+                # trailing partial word, wait for the rest unless we are done
+                if done:
+                    self._place_word(text[self.cursor:revealed])
+                    self.cursor = revealed
+                break
+
+            end = min(ends)
+            self._place_word(text[self.cursor:end])
+            if end == newline:
+                self._finish_line()
+            self.cursor = end + 1
+
+    def visible_lines(self, revealed, max_lines):
+        """Surfaces for the last `max_lines` lines of the revealed text."""
+        self.advance(revealed)
+
+        partial = self.text[self.cursor:revealed]
+        key = (self.current_line, partial)
+        if key != self.live_key:
+            self.live_key = key
+            line = self.current_line + partial
+            if partial and self.current_line and self.font.size(line)[0] >= self.max_width:
+                live = [self.current_line, partial]
+            else:
+                live = [line]
+            self.live_surfaces = [self.font.render(l, True, self.color) for l in live]
+
+        lines = self.lines + self.live_surfaces
+        return lines[-max_lines:]
+
 
 class DialogueBox:
     def __init__(self, font_size=24):
         # Configuration
-        self.font = pygame.font.SysFont("Courier New", font_size, bold=True)
+        self.font = Fonts.get("mono", font_size, bold=True)
         self.text_color = (0, 255, 100)  # Terminal Green
         self.bg_color = (0, 20, 0, 220)  # Darker, slightly opaque bg
         self.border_color = (0, 200, 80)
-        
+
         # Dimensions
         self.padding = 20
         self.width = WINDOW_WIDTH - 100
         self.height = 200
         self.rect = pygame.Rect(50, 20, self.width, self.height)
-        
+
+        # Panel (built once, reused every frame)
+        self.panel = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+        self.panel.fill(self.bg_color)
+        pygame.draw.rect(self.panel, self.border_color, self.panel.get_rect(), 2)
+
         # State
+        self.inbox = queue.Queue()  # messages from AI threads, shown by update()
         self.active = False
         self.target_text = ""
-        self.display_text = ""
         self.char_index = 0
-        self.last_update = 0
-        self.typing_speed = 20  # Fast typing
-        
+        self.start_time = 0
+        self.typing_speed = 20  # ms per character
+
+        # region changed by the last draw (None = unchanged)
+        self.dirty_rect = None
+        self.drawn_index = None
+        self.drawn_lines = 0
+
         # Text Rendering
-        self.line_height = self.font.get_height() + 5
+        self.line_height = Fonts.metrics("mono", font_size, bold=True)["height"] + 5
         self.max_lines = (self.height - (self.padding * 2)) // self.line_height
+        self.layout = TextLayout(
+            self.font, self.width - (self.padding * 2), self.text_color
+        )
+
+    @property
+    def display_text(self):
+        return self.target_text[:self.char_index]
 
     def show_message(self, message):
-        """Start showing a new message."""
+        """
+        Queue a new message (safe from any thread); the next update() on
+        the main thread starts showing it, so only the main thread ever
+        touches the layout.
+        """
+        self.inbox.put(message)
+
+    def start(self, message):
+        if isinstance(message, (list, tuple)):
+            message = "\n".join(message)
+
         self.target_text = message
-        self.display_text = ""
         self.char_index = 0
+        self.layout.reset(message)
+        self.drawn_index = None
+        self.start_time = pygame.time.get_ticks()
         self.active = True
-        self.last_update = pygame.time.get_ticks()
+
+    def is_typing(self):
+        return not self.inbox.empty() or (self.active and self.char_index < len(self.target_text))
 
     def update(self):
+        while True:
+            try:
+                self.start(self.inbox.get_nowait())
+            except queue.Empty:
+                break
+
         if not self.active:
             return
 
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_update > self.typing_speed:
-            if self.char_index < len(self.target_text):
-                self.display_text += self.target_text[self.char_index]
-                self.char_index += 1
-                self.last_update = current_time
-
-    def _wrap_text(self, text):
-        """
-        Splits text into lines that fit within the box width.
-        Respects existing newlines.
-        """
-        lines = []
-        # split by existing newlines first
-        paragraphs = text.split('\n')
-        
-        for paragraph in paragraphs:
-            words = paragraph.split(' ')
-            current_line = ""
-            
-            for word in words:
-                test_line = current_line + word + " "
-                fw, _ = self.font.size(test_line)
-                
-                if fw < (self.width - (self.padding * 2)):
-                    current_line = test_line
-                else:
-                    lines.append(current_line)
-                    current_line = word + " "
-            lines.append(current_line)
-            
-        return lines
+        # reveal by elapsed time so slow frames don't slow the typewriter
+        elapsed = pygame.time.get_ticks() - self.start_time
+        self.char_index = min(len(self.target_text), elapsed // self.typing_speed)
 
     def draw(self, surface):
         if not self.active:
+            self.dirty_rect = None
             return
 
-        # 1. Draw Background & Border
-        bg_surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        bg_surface.fill(self.bg_color)
-        surface.blit(bg_surface, self.rect.topleft)
-        pygame.draw.rect(surface, self.border_color, self.rect, 2)
+        # 1. Background & Border
+        surface.blit(self.panel, self.rect.topleft)
 
-        # 2. Wrap and Render Text
-        lines = self._wrap_text(self.display_text)
+        # 2. Text (scrolls to the last N lines)
+        lines = self.layout.visible_lines(self.char_index, self.max_lines)
 
-        # Scroll: If too many lines, show only the last N lines
-        if len(lines) > self.max_lines:
-            lines = lines[-self.max_lines:]
+        pos_x = self.rect.x + self.padding
+        pos_y = self.rect.y + self.padding
+        surface.fblits(
+            (text_surf, (pos_x, pos_y + i * self.line_height))
+            for i, text_surf in enumerate(lines)
+        )
 
-        for i, line in enumerate(lines):
-            text_surf = self.font.render(line, True, self.text_color)
-            pos_x = self.rect.x + self.padding
-            pos_y = self.rect.y + self.padding + (i * self.line_height)
-            surface.blit(text_surf, (pos_x, pos_y))
+        # 3. Dirty region: the typing line, or the whole box on a new
+        # message / scroll
+        line_count = len(self.layout.lines) + len(self.layout.live_surfaces)
+        if self.drawn_index is None or line_count != self.drawn_lines:
+            self.dirty_rect = self.rect
+        elif self.char_index != self.drawn_index:
+            self.dirty_rect = pygame.Rect(
+                pos_x, pos_y + (len(lines) - 1) * self.line_height,
+                self.rect.right - pos_x, self.line_height
+            )
+        else:
+            self.dirty_rect = None
+        self.drawn_index = self.char_index
+        self.drawn_lines = line_count
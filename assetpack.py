@@ -0,0 +1,208 @@
+import builtins
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from os.path import join, exists, isdir, relpath
+
+from settings import *
+
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHHI")   # magic, version, reserved, index length
+MAGIC = b"PPAK"
+ALIGN = 16
+PACKED = (".png", ".jpg", ".tmx", ".tsx", ".ttf", ".otf")
+
+
+# =========================
+# PACK
+# =========================
+def build_pack(out_path=ASSET_PACK, root=ASSETS_DIR, extensions=PACKED):
+    """
+    Write every asset under `root` into one archive:
+
+        header  magic, version, index length
+        index   JSON: path -> [offset, length, sha256]
+        data    each file's bytes, 16-byte aligned
+
+    Paths are relative to ASSETS_DIR and '/'-separated, as Assets uses them.
+    """
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            if name.lower().endswith(extensions):
+                path = join(directory, name)
+                files.append((relpath(path, root).replace(os.sep, "/"), path))
+    files.sort()
+
+    blobs = {}
+    for name, path in files:
+        with open(path, "rb") as file:
+            blobs[name] = file.read()
+
+    # offsets depend on the index length, so settle them first
+    index = {}
+    while True:
+        encoded = json.dumps(index).encode()
+        position = HEADER.size + len(encoded)
+        placed = {}
+        for name, data in blobs.items():
+            position += -position % ALIGN
+            placed[name] = [position, len(data), hashlib.sha256(data).hexdigest()]
+            position += len(data)
+        if placed == index:
+            break
+        index = placed
+
+    with open(out_path + ".tmp", "wb") as file:
+        file.write(HEADER.pack(MAGIC, PACK_VERSION, 0, len(encoded)))
+        file.write(encoded)
+        for name, data in blobs.items():
+            file.write(b"\0" * (index[name][0] - file.tell()))
+            file.write(data)
+    os.replace(out_path + ".tmp", out_path)
+    return index
+
+
+# =========================
+# RUNTIME
+# =========================
+class PackedFile(io.RawIOBase):
+    """Read-only file object over a slice of the mapped pack; no copy until read."""
+
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self.view[self.position:self.position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = (0, self.position, len(self.view))[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+class AssetPack:
+    """
+    The packed assets, mmap'd once per process.
+
+    open() returns a file object for an ASSETS_DIR-relative path, served
+    from the pack when ASSET_PACK exists and holds it, and from the loose
+    file otherwise, so development works without packing. When the
+    loose assets/ tree is present, a loose file edited after the pack was
+    built wins over its packed copy (one stat per read); a packaged build
+    without assets/ reads the pack only.
+    """
+
+    index = None     # path -> [offset, length, sha256]; {} when there is no pack
+    folders = {}     # folder -> [file names]
+    buffer = None
+    packed_at = 0    # pack mtime, ns
+    loose = False    # whether an assets/ tree sits next to the pack
+    lock = threading.Lock()
+
+    @classmethod
+    def mount(cls, path=ASSET_PACK):
+        with cls.lock:
+            if cls.index is not None:
+                return
+            if not exists(path):
+                cls.index = {}
+                return
+
+            with open(path, "rb") as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, index_length = HEADER.unpack_from(buffer)
+            if magic != MAGIC or version != PACK_VERSION:
+                print(f"WARNING: {path} is not a version {PACK_VERSION} asset pack, using loose files")
+                cls.index = {}
+                return
+
+            cls.buffer = memoryview(buffer)
+            cls.packed_at = os.stat(path).st_mtime_ns
+            cls.loose = isdir(ASSETS_DIR)
+            cls.index = json.loads(buffer[HEADER.size:HEADER.size + index_length])
+            for name in cls.index:
+                folder, _, file = name.rpartition("/")
+                cls.folders.setdefault(folder, []).append(file)
+
+    @classmethod
+    def view(cls, path):
+        """Zero-copy bytes of a packed file, or None (not packed, or edited since)."""
+        cls.mount()
+        entry = cls.index.get(path)
+        if not entry or cls.edited(path):
+            return None
+        offset, length, _ = entry
+        return cls.buffer[offset:offset + length]
+
+    @classmethod
+    def edited(cls, path):
+        """Whether the loose copy of a packed file is newer than the pack."""
+        if not cls.loose:
+            return False
+        try:
+            return os.stat(join(ASSETS_DIR, *path.split("/"))).st_mtime_ns > cls.packed_at
+        except FileNotFoundError:
+            return False
+
+    @classmethod
+    def open(cls, path):
+        view = cls.view(path)
+        if view is not None:
+            return PackedFile(view)
+        return builtins.open(join(ASSETS_DIR, *path.split("/")), "rb")
+
+    @classmethod
+    def read(cls, path):
+        with cls.open(path) as file:
+            return file.read()
+
+    @classmethod
+    def listdir(cls, folder):
+        """File names directly inside an ASSETS_DIR-relative folder."""
+        cls.mount()
+        if folder in cls.folders:
+            return list(cls.folders[folder])
+        directory = join(ASSETS_DIR, *folder.split("/"))
+        return [name for name in os.listdir(directory) if not os.path.isdir(join(directory, name))]
+
+    @classmethod
+    def verify(cls):
+        """Paths whose packed bytes no longer match their recorded hash."""
+        cls.mount()
+        return [
+            path for path, (offset, length, digest) in cls.index.items()
+            if hashlib.sha256(cls.buffer[offset:offset + length]).hexdigest() != digest
+        ]
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--verify"]:
+        AssetPack.mount()
+        bad = AssetPack.verify()
+        print(f"{len(AssetPack.index)} files, {len(bad)} corrupt")
+        for path in bad:
+            print(f"    {path}")
+    else:
+        out_path = sys.argv[1] if len(sys.argv) > 1 else ASSET_PACK
+        index = build_pack(out_path)
+        total = sum(length for _, length, _ in index.values())
+        print(f"{out_path}: {len(index)} files, {total / 2**20:.1f} MiB")
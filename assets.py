@@ -0,0 +1,147 @@
+import pygame
+import threading
+from collections import OrderedDict
+import os
+from os.path import normpath, relpath
+from settings import *
+from assetpack import AssetPack
+
+
+def asset_path(path):
+    """Absolute or map-relative image path -> ASSETS_DIR-relative, '/'-separated."""
+    return relpath(normpath(path), ASSETS_DIR).replace(os.sep, "/")
+
+
+class Assets:
+    """
+    Shared surface cache, process-wide.
+
+    Surfaces are loaded and converted once per (path, alpha) and scaled
+    variants once per (path, alpha, size). Scenes declare what they need
+    up front with acquire(); the StateManager releases a scene's assets
+    when it is replaced. Unreferenced surfaces are not dropped at once:
+    they wait in an LRU bounded by ASSET_CACHE_MB, so coming back to a
+    scene (the flow loops to Boot) decodes nothing.
+
+    Paths are relative to ASSETS_DIR. Returned surfaces are shared and
+    must not be drawn on.
+    """
+
+    entries = {}           # key -> surface (held or cached)
+    refs = {}              # key -> number of owners holding it
+    owners = {}            # id(owner) -> [keys]
+    lru = OrderedDict()    # unreferenced keys, oldest first
+    lru_bytes = 0
+    lock = threading.RLock()
+
+    # stats
+    loads = 0
+    hits = 0
+
+    # =========================
+    # LOOKUP
+    # =========================
+    @classmethod
+    def get(cls, path, alpha=False, size=None):
+        """Cached surface without taking a reference (kept by the LRU)."""
+        with cls.lock:
+            key = (path, alpha, tuple(size) if size else None)
+            surface = cls.entries.get(key)
+            if surface:
+                cls.hits += 1
+                if key in cls.lru:
+                    cls.lru.move_to_end(key)
+                return surface
+
+            if size:
+                surface = pygame.transform.scale(cls.get(path, alpha), size)
+            else:
+                surface = cls.convert(cls.decode(path), alpha)
+                cls.loads += 1
+
+            cls.entries[key] = surface
+            cls.cache(key)
+            return surface
+
+    @classmethod
+    def has(cls, path, alpha=False, size=None):
+        return (path, alpha, tuple(size) if size else None) in cls.entries
+
+    @staticmethod
+    def decode(path):
+        """Read and decode an image without converting it (safe on any thread)."""
+        with AssetPack.open(path) as file:
+            return pygame.image.load(file, path)
+
+    @staticmethod
+    def convert(image, alpha):
+        return image.convert_alpha() if alpha else image.convert()
+
+    @classmethod
+    def adopt(cls, path, alpha, image):
+        """Convert and cache an image decoded elsewhere (see Preloader)."""
+        with cls.lock:
+            key = (path, alpha, None)
+            if key not in cls.entries:
+                cls.entries[key] = cls.convert(image, alpha)
+                cls.cache(key)
+
+    @classmethod
+    def acquire(cls, owner, specs):
+        """
+        Reference every asset in `specs` ({name: (path, alpha, size)}) on
+        behalf of `owner` and return {name: surface}.
+        """
+        with cls.lock:
+            held = cls.owners.setdefault(id(owner), [])
+            surfaces = {}
+            for name, (path, alpha, size) in specs.items():
+                surfaces[name] = cls.get(path, alpha, size)
+                key = (path, alpha, tuple(size) if size else None)
+                cls.refs[key] = cls.refs.get(key, 0) + 1
+                held.append(key)
+                cls.uncache(key)
+            return surfaces
+
+    @classmethod
+    def release(cls, owner):
+        """Drop `owner`'s references; no-op if it never acquired anything."""
+        with cls.lock:
+            for key in cls.owners.pop(id(owner), ()):
+                cls.refs[key] -= 1
+                if not cls.refs[key]:
+                    del cls.refs[key]
+                    cls.cache(key)
+
+    # =========================
+    # LRU
+    # =========================
+    @staticmethod
+    def size_of(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    @classmethod
+    def cache(cls, key):
+        if key in cls.refs or key in cls.lru:
+            return
+        cls.lru[key] = None
+        cls.lru_bytes += cls.size_of(cls.entries[key])
+
+        budget = ASSET_CACHE_MB * 1024 * 1024
+        while cls.lru_bytes > budget and len(cls.lru) > 1:
+            old, _ = cls.lru.popitem(last=False)
+            cls.lru_bytes -= cls.size_of(cls.entries.pop(old))
+
+    @classmethod
+    def uncache(cls, key):
+        if key in cls.lru:
+            del cls.lru[key]
+            cls.lru_bytes -= cls.size_of(cls.entries[key])
+
+    @classmethod
+    def report(cls):
+        held = sum(cls.size_of(cls.entries[key]) for key in cls.refs)
+        return (
+            f"assets: {cls.loads} decoded, {cls.hits} hits, "
+            f"{held // 1024} KiB held, {cls.lru_bytes // 1024} KiB cached"
+        )
@@ -0,0 +1,127 @@
+import pygame
+import hashlib
+import io
+import os
+import struct
+import numpy as np
+from os.path import join, exists
+from settings import *
+from assets import asset_path
+from assetpack import AssetPack
+
+ATLAS_WIDTHS = (512, 1024, 1536, 2048, 3072, 4096)
+
+
+def image_size(data):
+    """(width, height) of an encoded image, read from the PNG header when possible."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return struct.unpack(">II", data[16:24])
+    return pygame.image.load(io.BytesIO(data)).get_size()
+
+
+def pack(sizes):
+    """Shelf-pack at several widths and keep the smallest atlas."""
+    best = None
+    for width in ATLAS_WIDTHS:
+        positions, size = shelf_pack(sizes, width)
+        if best is None or size[0] * size[1] < best[1][0] * best[1][1]:
+            best = positions, size
+    return best
+
+
+def shelf_pack(sizes, width):
+    """
+    Place rectangles on horizontal shelves, tallest first.
+    Returns ([(x, y)] in input order, atlas size).
+    """
+    width = max([width] + [w for w, _ in sizes])
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+
+    x = y = shelf_height = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+
+    used_width = max((px + sizes[i][0] for i, (px, _) in enumerate(positions)), default=1)
+    return positions, (used_width, max(1, y + shelf_height))
+
+
+def build_atlas(tiles, used, directory):
+    """
+    Pack the tiles a level references into one image and remap their gids.
+
+    tiles      gid -> [asset path, rect or None (whole image), flags, colorkey] | None
+    used       gids referenced by tile layers and objects
+    directory  where the atlas PNG is written
+
+    The atlas is named after a hash of what it holds, so levels using the
+    same tiles (level2/level3) share one file and one decoded surface.
+
+    Returns (new tile table, old -> new gid lookup array, report dict).
+    Flipped variants of a tile keep their own gid but share its pixels.
+    """
+    used = sorted(gid for gid in used if gid and tiles[gid])
+
+    # unique regions cut from tilesets; single-image tiles (collections)
+    # are already exactly what is used and stay in their own files
+    keys = sorted({
+        (tiles[gid][0], tuple(tiles[gid][1])) for gid in used if tiles[gid][1]
+    })
+    positions, size = pack([rect[2:] for _, rect in keys])
+
+    # name the atlas after its content; an unchanged one is not redrawn
+    # (this keeps rebakes of an edited map fast, see hot_reload.py)
+    files = {}
+    for gid in used:
+        path = tiles[gid][0]
+        if path not in files:
+            files[path] = AssetPack.read(path)
+    bytes_before = sum(4 * w * h for w, h in map(image_size, files.values()))
+
+    digest = hashlib.sha1(repr(keys).encode())
+    for path in sorted({path for path, _ in keys}):
+        digest.update(files[path])
+    out_path = join(directory, f"atlas-{digest.hexdigest()[:16]}.png")
+    name = asset_path(out_path)
+
+    if not exists(out_path):
+        sources = {path: pygame.image.load(io.BytesIO(files[path]), path) for path, _ in keys}
+        atlas = pygame.Surface(size, pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+        atlas.fblits([
+            (sources[path].subsurface(rect), position)
+            for (path, rect), position in zip(keys, positions)
+        ])
+        pygame.image.save(atlas, out_path + ".tmp.png")
+        os.replace(out_path + ".tmp.png", out_path)
+
+    placed = {key: [x, y, *key[1][2:]] for key, (x, y) in zip(keys, positions)}
+
+    lookup = np.zeros(len(tiles), dtype=np.uint32)
+    table = [None]
+    kept = set()
+    for gid in used:
+        path, rect, flags, colorkey = tiles[gid]
+        lookup[gid] = len(table)
+        if rect:
+            table.append([name, placed[(path, tuple(rect))], flags, colorkey])
+        else:
+            table.append([path, None, flags, colorkey])
+            kept.add(path)
+
+    bytes_after = size[0] * size[1] * 4 + sum(
+        4 * w * h for w, h in (image_size(files[path]) for path in kept)
+    )
+    report = {
+        "tiles": len(used),
+        "sources": len(files),
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+    }
+    return table, lookup, report
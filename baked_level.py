@@ -0,0 +1,467 @@
+import pygame
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import weakref
+import pytmx
+import numpy as np
+from glob import glob, escape as glob_escape
+from os.path import join, exists, dirname, basename, splitext, relpath
+from pytmx.util_pygame import handle_transformation, smart_convert
+
+from settings import *
+from assets import Assets, asset_path
+from assetpack import AssetPack
+from atlas import build_atlas
+
+BAKE_VERSION = 5
+HEADER = struct.Struct("<4sHH32sI")   # magic, version, reserved, source digest, meta length
+MAGIC = b"PLVL"
+ALIGN = 16
+
+
+# =========================
+# BAKE
+# =========================
+def read_source(path):
+    """
+    Bytes of a map file: the loose file when there is one (that is what
+    bake() parses), otherwise the packed copy.
+    """
+    if exists(path):
+        with open(path, "rb") as file:
+            return file.read()
+    return AssetPack.read(asset_path(path))
+
+
+# tmx path -> (stamps of the files hashed, digest); see source_digest()
+digest_cache = {}
+
+
+def stamp(path):
+    """(mtime, size) of a loose file, None when it is only packed."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def source_digest(tmx_path):
+    """
+    sha256 over the TMX and every external .tsx it references, plus the
+    settings that change what bake() writes. Cached until one of those
+    files changes (mtime, size), so loads and watcher polls of an
+    unchanged map only stat it.
+    """
+    cached = digest_cache.get(tmx_path)
+    if cached and all(stamp(path) == value for path, value in cached[0]):
+        return cached[1]
+
+    digest = hashlib.sha256(f"{BAKE_VERSION}:{int(LEVEL_ATLAS)}".encode())
+    files = [tmx_path]
+    data = read_source(tmx_path)
+    digest.update(data)
+
+    for source in re.findall(rb'<tileset[^>]*source="([^"]+)"', data):
+        path = join(dirname(tmx_path), source.decode())
+        files.append(path)
+        try:
+            digest.update(read_source(path))
+        except FileNotFoundError:
+            pass
+
+    digest_cache[tmx_path] = ([(path, stamp(path)) for path in files], digest.digest())
+    return digest_cache[tmx_path][1]
+
+
+def record_loader(filename, colorkey, **kwargs):
+    """pytmx image loader that records where each tile comes from instead of decoding."""
+    def load(rect=None, flags=None):
+        flags = flags or pytmx.TileFlags(False, False, False)
+        return [
+            asset_path(filename), list(rect) if rect else None, [int(f) for f in flags],
+            str(colorkey).lstrip("#") if colorkey else None
+        ]
+    return load
+
+
+def bake(tmx_path, out_path):
+    tmx_map = pytmx.TiledMap(tmx_path, image_loader=record_loader)
+    os.makedirs(dirname(out_path), exist_ok=True)
+
+    arrays = []           # (name, ndarray)
+    layers = []
+    for layer in tmx_map.layers:
+        entry = {"name": layer.name, "visible": bool(layer.visible)}
+
+        if isinstance(layer, pytmx.TiledTileLayer):
+            grid = np.array(layer.data, dtype=np.uint32)
+            entry["grid"] = f"grid:{layer.name}"
+            arrays.append((entry["grid"], grid))
+
+        elif isinstance(layer, pytmx.TiledObjectGroup):
+            objects, rects = [], []
+            for obj in layer:
+                objects.append({
+                    "id": obj.id, "name": obj.name, "type": obj.type,
+                    "x": obj.x, "y": obj.y, "width": obj.width, "height": obj.height,
+                    "gid": obj.gid, "rotation": obj.rotation,
+                    "properties": dict(obj.properties),
+                })
+
+                # collision rect: bounding box of the outline
+                points = getattr(obj, "as_points", None)
+                if points and hasattr(obj, "points"):
+                    xs = [p[0] for p in points]
+                    ys = [p[1] for p in points]
+                    rects.append((min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)))
+                else:
+                    rects.append((obj.x, obj.y, obj.width, obj.height))
+
+            entry["objects"] = objects
+            entry["rects"] = f"rects:{layer.name}"
+            arrays.append((entry["rects"], np.array(rects, dtype=np.float32).reshape(-1, 4)))
+
+        layers.append(entry)
+
+    tiles = origins = tmx_map.images
+    report = None
+    if LEVEL_ATLAS:
+        # only the tiles this level uses, packed into one image, gids remapped
+        used = set()
+        for name, array in arrays:
+            if name.startswith("grid:"):
+                used.update(np.unique(array).tolist())
+        for entry in layers:
+            used.update(obj["gid"] for obj in entry.get("objects", ()))
+
+        tiles, lookup, report = build_atlas(origins, used, dirname(out_path))
+
+        # where each new gid's pixels originally came from, for diffing rebakes
+        remapped = [None] * len(tiles)
+        for gid in used:
+            if lookup[gid]:
+                remapped[lookup[gid]] = origins[gid]
+        origins = remapped
+
+        arrays = [
+            (name, lookup[array] if name.startswith("grid:") else array)
+            for name, array in arrays
+        ]
+        for entry in layers:
+            for obj in entry.get("objects", ()):
+                obj["gid"] = int(lookup[obj["gid"]])
+
+    meta = {
+        "source": relpath(tmx_path, BASE_DIR).replace(os.sep, "/"),
+        "width": tmx_map.width, "height": tmx_map.height,
+        "tilewidth": tmx_map.tilewidth, "tileheight": tmx_map.tileheight,
+        "tiles": tiles,                 # gid -> [image, rect, flags, colorkey] or None
+        "origins": origins,             # gid -> tileset [image, rect, flags, colorkey] before the atlas
+        "atlas": report,
+        "layers": layers,
+        "arrays": {},
+    }
+
+    # arrays follow the metadata; offsets are filled in on a second pass
+    # because the metadata length depends on them
+    while True:
+        encoded = json.dumps(meta, default=str).encode()
+        position = HEADER.size + len(encoded)
+        placed = {}
+        for name, array in arrays:
+            position += -position % ALIGN
+            placed[name] = {"offset": position, "dtype": array.dtype.str, "shape": list(array.shape)}
+            position += array.nbytes
+        if placed == meta["arrays"]:
+            break
+        meta["arrays"] = placed
+
+    with open(out_path + ".tmp", "wb") as file:
+        file.write(HEADER.pack(MAGIC, BAKE_VERSION, 0, source_digest(tmx_path), len(encoded)))
+        file.write(encoded)
+        for name, array in arrays:
+            file.write(b"\0" * (placed[name]["offset"] - file.tell()))
+            file.write(array.tobytes())
+    os.replace(out_path + ".tmp", out_path)
+
+
+# =========================
+# RUNTIME
+# =========================
+class LevelObject:
+    """An object from a baked object layer (the subset of pytmx.TiledObject scenes use)."""
+
+    __slots__ = ("parent", "id", "name", "type", "x", "y", "width", "height",
+                 "gid", "rotation", "properties")
+
+    def __init__(self, parent, record):
+        self.parent = parent
+        for key, value in record.items():
+            setattr(self, key, value)
+
+    @property
+    def image(self):
+        return self.parent.image(self.gid) if self.gid else None
+
+
+class BakedLevel:
+    """
+    A level compiled from TMX into one binary file under LEVEL_CACHE_DIR:
+
+        header    magic, version, sha256 of the TMX (+ .tsx files)
+        metadata  JSON: layers, object table, gid -> tileset image/rect/flags
+                  (with LEVEL_ATLAS, gids are remapped into a per-level
+                  atlas holding only the tiles the map uses)
+        arrays    uint32 gid grid per tile layer, float32 (n, 4) rect
+                  array per object layer
+
+    The file is mmap'd and the arrays are NumPy views into it, so loading
+    does no XML parsing and no image decoding. Tile images are cut from
+    their tileset (shared through Assets) the first time a gid is used,
+    and shared between levels by (image, rect, flags, colorkey): maps
+    built from the same tiles end up on the same atlas and cut each tile
+    once.
+
+    load() rebakes whenever the TMX content hash no longer matches, or
+    an image the bake refers to (its atlas) has gone missing.
+    """
+
+    loaded = {}     # source digest -> BakedLevel
+    paths = {}      # tmx path -> source digest it was last loaded with
+    # (image path, rect, flags, colorkey) -> converted tile surface, held weakly:
+    # levels (and sprites) own their tiles, the cache only shares them
+    tile_cache = weakref.WeakValueDictionary()
+    lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, self.digest, meta_length = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != BAKE_VERSION:
+            raise ValueError(f"{path}: not a version {BAKE_VERSION} baked level")
+
+        meta = json.loads(self.buffer[HEADER.size:HEADER.size + meta_length])
+        self.filename = join(BASE_DIR, meta["source"])
+        self.width, self.height = meta["width"], meta["height"]
+        self.tilewidth, self.tileheight = meta["tilewidth"], meta["tileheight"]
+        self.tile_sources = meta["tiles"]
+        self.origins = meta["origins"]
+        self.atlas = meta["atlas"]
+
+        self.arrays = {}
+        for name, spec in meta["arrays"].items():
+            count = int(np.prod(spec["shape"]))
+            self.arrays[name] = np.frombuffer(
+                self.buffer, np.dtype(spec["dtype"]), count, spec["offset"]
+            ).reshape(spec["shape"])
+
+        self.layers = {layer["name"]: layer for layer in meta["layers"]}
+        self.layernames = list(self.layers)
+        self.tile_layers = [
+            layer["name"] for layer in meta["layers"] if "grid" in layer and layer["visible"]
+        ]
+
+        # object table: layer -> objects, (layer, name) -> objects
+        self.object_table = {}
+        self.name_index = {}
+        for layer in meta["layers"]:
+            objects = [LevelObject(self, record) for record in layer.get("objects", ())]
+            self.object_table[layer["name"]] = objects
+            for obj in objects:
+                self.name_index.setdefault((layer["name"], obj.name), []).append(obj)
+
+        self.images = {}
+        self.tile_lists = {}
+
+    @classmethod
+    def load(cls, tmx_path):
+        """
+        The baked level for `tmx_path`. Instances are shared by content:
+        identical maps load once, and a changed TMX gets a fresh instance.
+        """
+        digest = source_digest(tmx_path)
+        with cls.lock:
+            level = cls.loaded.get(digest)
+            if level:
+                return level
+
+            # this path's previous content is stale unless another map shares it
+            old = cls.paths.pop(tmx_path, None)
+            if old and old not in cls.paths.values():
+                cls.loaded.pop(old, None)
+
+            # named by content, so a rebake never overwrites a file that a
+            # running level still has mapped (see hot_reload.py)
+            name = splitext(basename(tmx_path))[0]
+            path = join(LEVEL_CACHE_DIR, f"{name}-{digest.hex()[:12]}.lvl")
+
+            level = None
+            if exists(path):
+                with open(path, "rb") as file:
+                    header = file.read(HEADER.size)
+                if len(header) == HEADER.size:
+                    magic, version, _, baked_digest, _ = HEADER.unpack(header)
+                    if (magic, version, baked_digest) == (MAGIC, BAKE_VERSION, digest):
+                        level = cls(path)
+                if level and level.missing():
+                    print(f"LEVEL: {', '.join(level.missing())} missing")
+                    level = None
+
+            if level is None:
+                print(f"LEVEL: baking {basename(tmx_path)}")
+                bake(tmx_path, path)
+                level = cls(path)
+                for stale in glob(join(LEVEL_CACHE_DIR, glob_escape(name) + "-*.lvl")):
+                    if stale != path:
+                        try:
+                            os.remove(stale)
+                        except OSError:
+                            pass    # still mapped (Windows); removed by a later bake
+                prune_atlases()
+
+            cls.loaded[digest] = level
+            cls.paths[tmx_path] = digest
+            return level
+
+    # =========================
+    # QUERIES
+    # =========================
+    def grid(self, layer):
+        """gid grid (rows x columns) of a tile layer; read-only view."""
+        return self.arrays[self.layers[layer]["grid"]]
+
+    def rects(self, layer):
+        """(n, 4) float32 bounding rects of an object layer, in object order."""
+        entry = self.layers.get(layer)
+        if not entry or "rects" not in entry:
+            return np.zeros((0, 4), dtype=np.float32)
+        return self.arrays[entry["rects"]]
+
+    def objects(self, layer, name=None):
+        """Objects of a layer, optionally only those called `name`; [] if missing."""
+        if name is None:
+            return self.object_table.get(layer, [])
+        return self.name_index.get((layer, name), [])
+
+    def tiles(self, layer):
+        """[(x, y, image)] for every filled cell, like pytmx's layer.tiles()."""
+        tiles = self.tile_lists.get(layer)
+        if tiles is None:
+            grid = self.grid(layer)
+            ys, xs = np.nonzero(grid)
+            tiles = self.tile_lists[layer] = [
+                (x, y, image)
+                for x, y, gid in zip(xs.tolist(), ys.tolist(), grid[ys, xs].tolist())
+                if (image := self.image(gid))
+            ]
+        return tiles
+
+    def signature(self, layer):
+        """
+        Digest of a layer's content that ignores gid numbering and atlas
+        placement, so two bakes of a map can be compared layer by layer.
+        """
+        entry = self.layers[layer]
+        digest = hashlib.sha1(repr((entry["name"], entry["visible"])).encode())
+        if "grid" in entry:
+            grid = self.grid(layer)
+            gids, cells = np.unique(grid, return_inverse=True)
+            digest.update(repr((grid.shape, [self.origins[gid] for gid in gids.tolist()])).encode())
+            digest.update(cells.astype(np.uint32).tobytes())
+        if "objects" in entry:
+            records = [dict(obj, gid=self.origins[obj["gid"]]) for obj in entry["objects"]]
+            digest.update(json.dumps(records, sort_keys=True, default=str).encode())
+            digest.update(self.rects(layer).tobytes())
+        return digest.digest()
+
+    def changed_layers(self, other):
+        """Names of layers that differ from (or are missing in) `other`."""
+        names = set(self.layers) | set(other.layers)
+        return {
+            name for name in names
+            if name not in self.layers or name not in other.layers
+            or self.signature(name) != other.signature(name)
+        }
+
+    def sources(self):
+        """Every image file this level's tiles are cut from."""
+        return sorted({source[0] for source in self.tile_sources if source})
+
+    def missing(self):
+        """Source images that are neither loose nor packed, e.g. a deleted atlas."""
+        return [
+            path for path in self.sources()
+            if not exists(join(ASSETS_DIR, *path.split("/"))) and AssetPack.view(path) is None
+        ]
+
+    def image(self, gid):
+        image = self.images.get(gid)
+        if image is None:
+            source = self.tile_sources[gid]
+            if source is None:
+                return None
+            image = self.images[gid] = self.tile(*source)
+        return image
+
+    @classmethod
+    def tile(cls, path, rect, flags, colorkey):
+        """A tile cut from `path`, shared by every level that uses it."""
+        key = (path, tuple(rect) if rect else None, tuple(flags), colorkey)
+        image = cls.tile_cache.get(key)
+        if image is None:
+            image = Assets.get(path, alpha=True)
+            if rect:
+                image = image.subsurface(rect)
+            if any(flags):
+                image = handle_transformation(image, pytmx.TileFlags(*flags))
+            if colorkey:
+                colorkey = pygame.Color(f"#{colorkey}")
+            image = cls.tile_cache[key] = smart_convert(image, colorkey, True)
+        return image
+
+
+def prune_atlases(directory=LEVEL_CACHE_DIR):
+    """Delete atlas images no baked level in `directory` refers to any more."""
+    used = set()
+    for path in glob(join(directory, "*.lvl")):
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                continue
+            magic, version, _, _, meta_length = HEADER.unpack(header)
+            if (magic, version) != (MAGIC, BAKE_VERSION):
+                continue
+            meta = json.loads(file.read(meta_length))
+        used.update(basename(source[0]) for source in meta["tiles"] if source)
+
+    for path in glob(join(directory, "atlas-*.png")):
+        if basename(path) not in used:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def bake_all():
+    """Bake (or confirm up to date) every map in assets/Maps."""
+    for tmx_path in sorted(glob(join(ASSETS_DIR, "Maps", "*.tmx"))):
+        level = BakedLevel.load(tmx_path)
+        print(f"{basename(tmx_path)} -> {level.path} ({os.path.getsize(level.path) // 1024} KiB)")
+        if level.atlas:
+            atlas = level.atlas
+            print(
+                f"    atlas: {atlas['tiles']} tiles from {atlas['sources']} images, decoded "
+                f"{atlas['bytes_before'] / 2**20:.1f} MiB -> {atlas['bytes_after'] / 2**20:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    bake_all()
@@ -0,0 +1,170 @@
+import pygame
+from settings import *
+
+CHUNK_SIZE = TILE_SIZE * 8
+
+
+class CameraGroup(pygame.sprite.Group):
+    """
+    Sprite group that draws with a camera offset and skips anything
+    outside the viewport.
+
+    Sprites flagged `static = True` (tiles, decorations) are bucketed into
+    fixed-size chunks on the first draw after they are added, so a frame
+    only looks at the chunks the viewport touches. Everything else (the
+    player) is checked every frame.
+
+    Sprites draw in insertion order unless they carry a `z` (lower first),
+    which streamed chunks use to stay under sprites added before them.
+
+    Drawing onto a smaller target (see RenderTarget) passes `scale`; visible
+    images are then shrunk as they are drawn. Nothing is cached, so the
+    low-resolution path holds no second copy of every image. Targets that
+    set `bake_static` (see TextureCanvas) get each chunk flattened into a
+    single surface instead of one draw per tile.
+    """
+
+    def __init__(self, *sprites):
+        self.chunks = {}
+        self.baked = {}
+        self.pending = []
+        self.dynamic = []
+        self.order = {}
+        self.next_order = 0
+        self.max_width = 0
+        self.max_height = 0
+
+        # stats for the last draw call
+        self.visible_count = 0
+        self.culled_count = 0
+
+        super().__init__(*sprites)
+
+    # ------------------ MEMBERSHIP ------------------
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.order[sprite] = (getattr(sprite, "z", 0), self.next_order)
+        self.next_order += 1
+
+        # sprites join their groups before they have a rect, so static ones
+        # are filed into chunks later
+        if getattr(sprite, "static", False):
+            self.pending.append(sprite)
+        else:
+            self.dynamic.append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        del self.order[sprite]
+
+        if getattr(sprite, "static", False):
+            if sprite in self.pending:
+                self.pending.remove(sprite)
+            else:
+                key = self.chunk_key(sprite.rect)
+                self.chunks[key].remove(sprite)
+                self.baked.pop(key, None)
+        else:
+            self.dynamic.remove(sprite)
+
+    def chunk_key(self, rect):
+        return int(rect.x) // CHUNK_SIZE, int(rect.y) // CHUNK_SIZE
+
+    def file_pending(self):
+        for sprite in self.pending:
+            rect = sprite.rect
+            self.chunks.setdefault(self.chunk_key(rect), []).append(sprite)
+            self.max_width = max(self.max_width, int(rect.width))
+            self.max_height = max(self.max_height, int(rect.height))
+        self.pending.clear()
+        self.baked.clear()
+
+    def baked_chunk(self, key):
+        """All static sprites of a chunk flattened into one surface."""
+        baked = self.baked.get(key)
+        if baked is None:
+            left, top = key[0] * CHUNK_SIZE, key[1] * CHUNK_SIZE
+            baked = pygame.Surface(
+                (CHUNK_SIZE + self.max_width, CHUNK_SIZE + self.max_height),
+                pygame.SRCALPHA
+            )
+            baked.fblits([
+                (sprite.image, (sprite.rect.x - left, sprite.rect.y - top))
+                for sprite in self.chunks[key]
+            ])
+            self.baked[key] = baked
+        return baked
+
+    # ------------------ QUERY ------------------
+
+    def chunks_in_view(self, view):
+        """Keys of non-empty chunks that may overlap `view`."""
+        # a sprite is filed under the chunk of its top-left corner, so widen
+        # the search by the largest static sprite to catch overhangs
+        first_x = (view.left - self.max_width) // CHUNK_SIZE
+        first_y = (view.top - self.max_height) // CHUNK_SIZE
+        last_x = view.right // CHUNK_SIZE
+        last_y = view.bottom // CHUNK_SIZE
+
+        chunks = self.chunks
+        return [
+            (cx, cy)
+            for cy in range(first_y, last_y + 1)
+            for cx in range(first_x, last_x + 1)
+            if chunks.get((cx, cy))
+        ]
+
+    def visible_sprites(self, view):
+        """Sprites overlapping `view` (world space), in insertion order."""
+        if self.pending:
+            self.file_pending()
+
+        candidates = []
+        for key in self.chunks_in_view(view):
+            candidates.extend(self.chunks[key])
+        candidates.extend(self.dynamic)
+        candidates.sort(key=self.order.__getitem__)
+
+        return [sprite for sprite in candidates if view.colliderect(sprite.rect)]
+
+    # ------------------ DRAW ------------------
+
+    def draw(self, surface, offset=(0, 0), scale=1):
+        ox, oy = int(offset[0]), int(offset[1])
+        view = pygame.Rect(
+            ox, oy, surface.get_width() * scale, surface.get_height() * scale
+        )
+
+        blits = []
+        if getattr(surface, "bake_static", False):
+            # texture targets: one draw per chunk, then the moving sprites
+            if self.pending:
+                self.file_pending()
+            for key in self.chunks_in_view(view):
+                blits.append((
+                    self.baked_chunk(key),
+                    (key[0] * CHUNK_SIZE - ox, key[1] * CHUNK_SIZE - oy)
+                ))
+            for sprite in self.dynamic:
+                rect = sprite.rect
+                if view.colliderect(rect):
+                    blits.append((sprite.image, (rect.x - ox, rect.y - oy)))
+        elif scale == 1:
+            for sprite in self.visible_sprites(view):
+                rect = sprite.rect
+                blits.append((sprite.image, (rect.x - ox, rect.y - oy)))
+        else:
+            shrink = 1 / scale
+            for sprite in self.visible_sprites(view):
+                rect = sprite.rect
+                blits.append((
+                    pygame.transform.scale_by(sprite.image, shrink),
+                    (int((rect.x - ox) / scale), int((rect.y - oy) / scale))
+                ))
+
+        surface.fblits(blits)
+
+        self.visible_count = len(blits)
+        self.culled_count = len(self.spritedict) - self.visible_count
+        return []
@@ -0,0 +1,120 @@
+import pygame
+import os
+import queue
+import struct
+import threading
+from os.path import join
+from settings import *
+
+
+class FrameCapture:
+    """
+    Records gameplay frames without stalling the main loop.
+
+    The main thread copies each frame into one of a fixed ring of
+    preallocated surfaces and hands it to a writer thread. If every slot
+    is still waiting to be written the frame is dropped and counted;
+    the game never waits for the disk.
+
+    formats:
+        "png"  one PNG per frame
+        "raw"  frames appended to frames.raw, each behind a small header
+               (frame, ticks_ms, width, height, pitch)
+
+    Both write frames.csv with the timestamp of every saved frame.
+    """
+
+    RAW_HEADER = struct.Struct("<IIHHI")
+
+    def __init__(self, directory=CAPTURE_DIR, fmt=CAPTURE, size=(WINDOW_WIDTH, WINDOW_HEIGHT),
+                 slots=8, every=CAPTURE_EVERY):
+        self.directory = directory
+        self.fmt = fmt
+        self.every = max(1, every)
+
+        self.slots = [pygame.Surface(size).convert() for _ in range(slots)]
+        self.free = queue.SimpleQueue()
+        for index in range(slots):
+            self.free.put(index)
+        self.filled = queue.SimpleQueue()
+
+        # stats
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    # =========================
+    # MAIN THREAD
+    # =========================
+    def capture(self, source):
+        """
+        Grab the current frame from a Surface (or a TextureBackend, before
+        it presents). Never blocks.
+        """
+        self.frame += 1
+        if self.frame % self.every:
+            return
+
+        try:
+            index = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        slot = self.slots[index]
+        renderer = getattr(source, "renderer", None)
+        if renderer:
+            renderer.to_surface(slot)
+        else:
+            slot.blit(source, (0, 0))
+
+        self.captured += 1
+        self.filled.put((index, self.frame, pygame.time.get_ticks()))
+
+    def stop(self):
+        self.filled.put(None)
+        self.writer.join()
+
+    def summary(self):
+        return (
+            f"capture: {self.captured} captured, {self.written} written, "
+            f"{self.dropped} dropped -> {self.directory}"
+        )
+
+    # =========================
+    # WRITER THREAD
+    # =========================
+    def _write_loop(self):
+        raw = open(join(self.directory, "frames.raw"), "ab") if self.fmt == "raw" else None
+        with open(join(self.directory, "frames.csv"), "a") as index_file:
+            while True:
+                item = self.filled.get()
+                if item is None:
+                    break
+
+                index, frame, ticks = item
+                slot = self.slots[index]
+                try:
+                    if raw:
+                        location = raw.tell()
+                        raw.write(self.RAW_HEADER.pack(
+                            frame, ticks, slot.get_width(), slot.get_height(), slot.get_pitch()
+                        ))
+                        # write straight from the surface's pixel buffer
+                        raw.write(slot.get_view("1"))
+                    else:
+                        location = f"frame_{frame:06d}.png"
+                        pygame.image.save(slot, join(self.directory, location))
+
+                    index_file.write(f"{frame},{ticks},{location}\n")
+                    self.written += 1
+                finally:
+                    self.free.put(index)
+
+        if raw:
+            raw.close()
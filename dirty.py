@@ -0,0 +1,66 @@
+import pygame
+from settings import *
+
+
+class DirtyTracker:
+    """
+    Turns the regions a scene reports as changed into the list of rects to
+    push with pygame.display.update().
+
+    Every region is pushed on the frame it changes and once more on the next
+    frame, so whatever moved away from it is cleared too. Reporting `None`
+    means "everything changed" and falls back to a full-frame push.
+    """
+
+    def __init__(self, size=(WINDOW_WIDTH, WINDOW_HEIGHT)):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.previous = [self.screen_rect]
+
+        # counters
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_pushed = 0
+
+    def invalidate(self):
+        """Force the next frame to be a full push (scene change, resize)."""
+        self.previous = [self.screen_rect]
+
+    def compose(self, rects):
+        """Rects to push this frame, or None for a full-frame flip."""
+        self.frames += 1
+
+        if rects is None:
+            self.previous = [self.screen_rect]
+            self.full_frames += 1
+            self.pixels_pushed += self.screen_rect.width * self.screen_rect.height
+            return None
+
+        current = [
+            self.screen_rect.clip(rect) for rect in rects if rect
+        ]
+        push = [rect for rect in current + self.previous if rect.width and rect.height]
+        self.previous = current
+
+        self.pixels_pushed += sum(rect.width * rect.height for rect in push)
+        return push
+
+    # ------------------ STATS ------------------
+
+    @property
+    def baseline_pixels(self):
+        return self.frames * self.screen_rect.width * self.screen_rect.height
+
+    @property
+    def push_ratio(self):
+        """Pixels pushed as a fraction of flipping the full frame every tick."""
+        if not self.frames:
+            return 1.0
+        return self.pixels_pushed / self.baseline_pixels
+
+    def summary(self):
+        per_frame = self.pixels_pushed // max(1, self.frames)
+        return (
+            f"dirty rects: {self.frames} frames, {self.full_frames} full, "
+            f"{per_frame} px/frame vs {self.screen_rect.width * self.screen_rect.height} "
+            f"({self.push_ratio:.1%} of full flip)"
+        )
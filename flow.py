@@ -1,8 +1,72 @@
+import importlib
+import threading
+import time
+
+
 class Flow:
     ORDER = ["boot", "level1", "level2", "level3", "level4", "ending"]
-    MAP = {}
+
+    # name -> "module:Class"; a scene module is imported the first time
+    # the scene is needed (or ahead of time by the Preloader's thread)
+    SCENES = {
+        "boot": "scenes.boot_scene:BootScene",
+        "level1": "scenes.level1_scene:Level1Scene",
+        "level2": "scenes.level2_scene:Level2Scene",
+        "level3": "scenes.level3_scene:Level3Scene",
+        "level4": "scenes.level4_scene:Level4Scene",
+    }
+    MAP = {}            # name -> scene class, filled as scenes are imported
+    import_ms = {}      # name -> time its first import took
+    lock = threading.Lock()
+
+    @classmethod
+    def scene(cls, name):
+        """The scene class registered as `name`, importing its module on first use."""
+        scene_cls = cls.MAP.get(name)
+        if scene_cls:
+            return scene_cls
+
+        with cls.lock:
+            if name not in cls.MAP:
+                module, attr = cls.SCENES[name].split(":")
+                started = time.perf_counter()
+                cls.MAP[name] = getattr(importlib.import_module(module), attr)
+                cls.import_ms[name] = (time.perf_counter() - started) * 1000
+            return cls.MAP[name]
 
     @classmethod
     def next(cls, current, manager, context):
         idx = cls.ORDER.index(current)
-        return cls.MAP[cls.ORDER[idx + 1]](manager, context)
+        return manager.scene(cls.scene(cls.ORDER[idx + 1]), context)
+
+    @classmethod
+    def name_of(cls, scene):
+        """Flow name of a scene instance, or None (e.g. a Transition)."""
+        # compared by import path so asking never imports anything
+        path = f"{type(scene).__module__}:{type(scene).__name__}"
+        for name, scene_path in cls.SCENES.items():
+            if scene_path == path:
+                return name
+        return None
+
+    @classmethod
+    def upcoming(cls, current, context):
+        """
+        Scenes that can follow `current`: the next one in ORDER (level3
+        only once the level2 choice is made) and boot, which every level
+        exits to.
+        """
+        names = []
+        idx = cls.ORDER.index(current)
+        if idx + 1 < len(cls.ORDER):
+            name = cls.ORDER[idx + 1]
+            if name != "level3" or context.flags.get("level2_choice"):
+                names.append(name)
+        if current != "boot":
+            names.append("boot")
+        return [name for name in names if name in cls.SCENES]
+
+    @classmethod
+    def summary(cls):
+        imported = ", ".join(f"{name} {ms:.0f} ms" for name, ms in cls.import_ms.items())
+        return f"scenes imported: {imported or 'none'}"
@@ -0,0 +1,105 @@
+import pygame
+from os.path import join, exists
+from settings import *
+
+FONTS_DIR = join(ASSETS_DIR, "Fonts")
+
+# face -> (bundled file stem, system fallbacks in order of preference);
+# "mono" ships as Source Code Pro (see assets/Fonts/OFL.txt), so the
+# system fallbacks are only used if the bundled files are removed
+FACES = {
+    "mono": ("mono", ["consolas", "couriernew", "dejavusansmono", "liberationmono"]),
+}
+
+
+class Fonts:
+    """
+    Font registry, shared process-wide.
+
+    Font files are resolved once per (face, style): a bundled file from
+    assets/Fonts (`mono.ttf`, `mono-bold.ttf`, ...) wins; otherwise the
+    system is searched once and the path remembered; otherwise pygame's
+    built-in font is used. Font objects are cached by (face, size, bold,
+    italic), so building a scene never touches the font list again.
+
+    Missing style files are synthesized with Font.bold / Font.italic.
+    """
+
+    paths = {}
+    fonts = {}
+    metric_cache = {}
+
+    @classmethod
+    def get(cls, face, size, bold=False, italic=False):
+        key = (face, size, bold, italic)
+        font = cls.fonts.get(key)
+        if font:
+            return font
+
+        path, styled = cls.resolve(face, bold, italic)
+        font = pygame.font.Font(path, size)
+        if not styled:
+            font.bold = bold
+            font.italic = italic
+
+        cls.fonts[key] = font
+        return font
+
+    @classmethod
+    def resolve(cls, face, bold, italic):
+        """(path or None, whether the file already carries the style)"""
+        key = (face, bold, italic)
+        if key in cls.paths:
+            return cls.paths[key]
+
+        stem, system_names = FACES.get(face, (face, []))
+        suffix = "-bold" * bold + "-italic" * italic
+
+        resolved = None
+        for name, styled in ((stem + suffix, True), (stem, False)):
+            for ext in (".ttf", ".otf"):
+                path = join(FONTS_DIR, name + ext)
+                if exists(path):
+                    resolved = (path, styled)
+                    break
+            if resolved:
+                break
+
+        if not resolved and system_names:
+            path = pygame.font.match_font(system_names, bold, italic)
+            if path:
+                resolved = (path, True)
+
+        if not resolved:
+            print(f"WARNING: No font found for '{face}', using pygame default")
+            resolved = (None, False)
+
+        cls.paths[key] = resolved
+        return resolved
+
+    @classmethod
+    def metrics(cls, face, size, bold=False, italic=False):
+        """
+        Layout metrics for a font: height, linesize, ascent, descent and
+        `advance` (width of one glyph, exact for monospaced faces).
+        """
+        key = (face, size, bold, italic)
+        metrics = cls.metric_cache.get(key)
+        if metrics:
+            return metrics
+
+        font = cls.get(face, size, bold, italic)
+        metrics = {
+            "height": font.get_height(),
+            "linesize": font.get_linesize(),
+            "ascent": font.get_ascent(),
+            "descent": font.get_descent(),
+            "advance": font.metrics("M")[0][4],
+        }
+        cls.metric_cache[key] = metrics
+        return metrics
+
+    @classmethod
+    def glyphs(cls, face, size, text, bold=False, italic=False):
+        """Per-character (minx, maxx, miny, maxy, advance), as Font.metrics."""
+        return cls.get(face, size, bold, italic).metrics(text)
@@ -0,0 +1,156 @@
+import pygame
+import numpy as np
+from settings import *
+
+
+class GlitchEffect:
+    """
+    Post-process pass that corrupts the finished frame in place through a
+    pygame.surfarray view: scanlines, chromatic channel shift, displaced
+    blocks and pixel noise.
+
+    Noise positions/colours are generated once and every scratch buffer is
+    allocated up front, so a frame only runs in-place NumPy operations.
+    Strength follows PROTOCOL's read of the player (`ProtocolAI.profile`).
+
+    Works on 32-bit surfaces (the display and anything `convert()`ed).
+    """
+
+    PASSES = ("scanlines", "shift", "blocks", "noise")
+    NOISE_POINTS = 1 << 16
+    MAX_SHIFT = 12
+    MAX_BLOCK_HEIGHT = 48
+
+    def __init__(self, size=(WINDOW_WIDTH, WINDOW_HEIGHT), profile=None, seed=None):
+        self.width, self.height = size
+        self.profile = profile
+        self.passes = self.PASSES
+        self.rng = np.random.default_rng(seed)
+
+        # precomputed noise table (colours packed once we know the format)
+        self.noise_y = self.rng.integers(0, self.height, self.NOISE_POINTS, dtype=np.intp)
+        self.noise_x = self.rng.integers(0, self.width, self.NOISE_POINTS, dtype=np.intp)
+        self.noise_rgb = self.rng.integers(0, 256, (self.NOISE_POINTS, 3), dtype=np.uint32)
+        self.noise_pixels = None
+        self.masks = None
+
+        # scratch buffers (rows x columns, like the transposed view)
+        self.channel = np.empty((self.height, self.width), dtype=np.uint32)
+        self.block = np.empty((self.MAX_BLOCK_HEIGHT, self.width), dtype=np.uint32)
+
+    def prepare(self, surface):
+        masks = surface.get_masks()
+        if masks == self.masks:
+            return
+
+        self.masks = masks
+        shifts = surface.get_shifts()
+        rgb = self.noise_rgb
+        self.noise_pixels = (
+            (rgb[:, 0] << shifts[0]) | (rgb[:, 1] << shifts[1]) | (rgb[:, 2] << shifts[2])
+        ).astype(np.uint32)
+        self.red_mask = np.uint32(masks[0])
+        self.keep_mask = np.uint32(~masks[0] & 0xFFFFFFFF)
+        # halves every channel without bleeding between them
+        self.half_mask = np.uint32(0x7F7F7F7F)
+
+    # =========================
+    # INTENSITY
+    # =========================
+    def intensity(self):
+        """0..1; chaotic, efficiency-driven operators corrupt PROTOCOL more."""
+        if not self.profile:
+            return 0.2
+
+        order = self.profile.get("order_vs_freedom", 0.0)
+        efficiency = self.profile.get("efficiency_vs_empathy", 0.0)
+        level = 0.2 + 0.5 * max(0.0, -order) + 0.3 * abs(efficiency)
+        return min(1.0, max(0.0, level))
+
+    # =========================
+    # PASSES (view is rows x columns of packed pixels)
+    # =========================
+    def scanlines(self, view):
+        # halve every third row
+        rows = view[::3]
+        np.right_shift(rows, 1, out=rows)
+        np.bitwise_and(rows, self.half_mask, out=rows)
+
+    def channel_shift(self, view, shift):
+        # move the red channel right by `shift` pixels
+        source = view[:, :self.width - shift]
+        target = view[:, shift:]
+        red = self.channel[:, :self.width - shift]
+
+        np.bitwise_and(source, self.red_mask, out=red)
+        np.bitwise_and(target, self.keep_mask, out=target)
+        np.bitwise_or(target, red, out=target)
+
+    def displace_block(self, view, top, height, dx):
+        # slide a horizontal band sideways, wrapping around
+        band = view[top:top + height]
+        buffer = self.block[:height]
+        np.copyto(buffer, band)
+        band[:, dx:] = buffer[:, :self.width - dx]
+        band[:, :dx] = buffer[:, self.width - dx:]
+
+    def noise(self, view, count):
+        start = int(self.rng.integers(0, self.NOISE_POINTS - count + 1))
+        end = start + count
+        view[self.noise_y[start:end], self.noise_x[start:end]] = self.noise_pixels[start:end]
+
+    # =========================
+    # APPLY
+    # =========================
+    def apply(self, surface, intensity=None):
+        if intensity is None:
+            intensity = self.intensity()
+        passes = self.passes
+        if intensity <= 0 or not passes:
+            return
+
+        self.prepare(surface)
+        rng = self.rng
+        view = pygame.surfarray.pixels2d(surface).T
+        try:
+            if "scanlines" in passes:
+                self.scanlines(view)
+
+            shift = int(self.MAX_SHIFT * intensity)
+            if shift and "shift" in passes:
+                self.channel_shift(view, shift)
+
+            # occasional torn blocks, more often when intense
+            if "blocks" in passes and rng.random() < intensity * 0.5:
+                height = int(rng.integers(4, self.MAX_BLOCK_HEIGHT))
+                top = int(rng.integers(0, self.height - height))
+                dx = int(rng.integers(1, self.width))
+                self.displace_block(view, top, height, dx)
+
+            if "noise" in passes:
+                self.noise(view, int(self.NOISE_POINTS * 0.25 * intensity))
+        finally:
+            # release the surface lock
+            del view
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(frames=120):
+    """Average ms per apply() at full strength on a window-sized surface."""
+    import time
+
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    effect = GlitchEffect(surface.get_size(), seed=0)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        effect.apply(surface, 1.0)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    print(f"glitch: {benchmark():.2f} ms/frame at {WINDOW_WIDTH}x{WINDOW_HEIGHT}")
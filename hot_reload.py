@@ -0,0 +1,96 @@
+import os
+import queue
+import threading
+import time
+from glob import glob
+from os.path import join, basename
+
+from settings import *
+from baked_level import BakedLevel
+
+
+class MapWatcher:
+    """
+    Development helper: reloads the running level when its map is saved.
+
+    A worker thread polls assets/Maps for changed .tmx/.tsx files and
+    rebakes every level this process has loaded (BakedLevel.load() only
+    rebakes a map whose content hash changed, so a tileset edit reaches
+    every map using it). The main thread hands new levels to the current
+    scene's reload(level), which diffs them layer by layer and rebuilds
+    only what changed.
+
+    Scenes without reload() are left alone; they pick the edit up the
+    next time they are built.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.directory = join(ASSETS_DIR, "Maps")
+        self.stamps = self.scan()
+        self.reloaded = queue.SimpleQueue()
+
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+
+    def scan(self):
+        stamps = {}
+        for path in glob(join(self.directory, "*.tmx")) + glob(join(self.directory, "*.tsx")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    # =========================
+    # MAIN THREAD
+    # =========================
+    def update(self, state):
+        """Call once per frame with the manager's current state."""
+        while True:
+            try:
+                tmx_path, level, bake_ms = self.reloaded.get_nowait()
+            except queue.Empty:
+                return
+
+            map_name = getattr(state, "MAP", None)
+            if not map_name or join(self.directory, map_name) != tmx_path:
+                continue
+            if not hasattr(state, "reload") or state.level is level:
+                continue
+
+            started = time.perf_counter()
+            changed = state.reload(level)
+            print(
+                f"RELOAD: {basename(tmx_path)} baked in {bake_ms:.0f} ms, "
+                f"{', '.join(sorted(changed)) or 'nothing'} rebuilt in "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+
+            # dev mode: confirm the patched scene matches a fresh build
+            if hasattr(state, "verify"):
+                stale = state.verify()
+                if stale:
+                    print(f"WARNING: {stale} sprites differ from a fresh build after reload")
+
+    # =========================
+    # WORKER THREAD
+    # =========================
+    def _work(self):
+        while True:
+            time.sleep(self.interval)
+            stamps = self.scan()
+            if stamps == self.stamps:
+                continue
+            self.stamps = stamps
+
+            for tmx_path in list(BakedLevel.paths):
+                started = time.perf_counter()
+                try:
+                    level = BakedLevel.load(tmx_path)
+                except Exception as e:
+                    # most likely saved mid-edit; the next save retries
+                    print(f"WARNING: Reloading {basename(tmx_path)} failed: {e}")
+                    continue
+                self.reloaded.put((tmx_path, level, (time.perf_counter() - started) * 1000))
@@ -1,41 +1,112 @@
-import pygame, sys
+import pygame, sys, time
 from state_manager import StateManager
 from game_context import GameContext
+from render_target import RenderTarget
+from pacing import FramePacer
+from quality import Quality, QualityProbe
 from settings import *
-
-from scenes.boot_scene import BootScene
-from scenes.level1_scene import Level1Scene
-from scenes.level2_scene import Level2Scene
-from scenes.level3_scene import Level3Scene
-from scenes.level4_scene import Level4Scene
 from flow import Flow
 
 pygame.init()
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-clock = pygame.time.Clock()
+if RENDER_BACKEND == "sdl2":
+    from texture_backend import TextureBackend
+    # hidden display keeps convert()/convert_alpha() working
+    screen = pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    backend = TextureBackend()
+else:
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    backend = None
+pacer = FramePacer()
+
+# only boot is needed for the first frame; later scenes are imported
+# (and prepared) by the preloader's thread, or on first use
+BootScene = Flow.scene("boot")
 
-Flow.MAP = {
-    "boot": BootScene,
-    "level1": Level1Scene,
-    "level2": Level2Scene,
-    "level3": Level3Scene,
-    "level4": Level4Scene
-}
+if PRELOAD:
+    from preload import warm_start
+    print(warm_start([BootScene]))
 
 context = GameContext()
 boot = BootScene(None, context)
 manager = StateManager(boot)
 boot.manager = manager
+manager.backend = backend
+if GLITCH_EFFECTS and not backend:
+    from glitch import GlitchEffect
+    manager.effects.append(GlitchEffect(screen.get_size(), context.ai.profile))
+if RENDER_SCALE != 1 and not backend:
+    manager.target = RenderTarget()
+if CAPTURE:
+    from capture import FrameCapture
+    capture = FrameCapture()
+else:
+    capture = None
+
+preloader = None
+if PRELOAD:
+    from preload import Preloader
+    preloader = Preloader(context)
+
+watcher = None
+if HOT_RELOAD:
+    from hot_reload import MapWatcher
+    watcher = MapWatcher()
+
+probe = None
+if QUALITY == "auto":
+    probe = QualityProbe(manager, pacer)
+elif QUALITY:
+    Quality.set(QUALITY, manager, pacer)
 
 while True:
-    dt = clock.tick(60) / 1000
+    dt = pacer.tick(manager.is_active())
+    frame_start = time.perf_counter()
 
     for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+        if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+            if DIRTY_RECTS:
+                print(manager.dirty.summary())
+            print(pacer.summary())
+            print(manager.pool.summary())
+            print(Flow.summary())
+            if preloader:
+                print(preloader.summary())
+            if capture:
+                capture.stop()
+                print(capture.summary())
             pygame.quit()
             sys.exit()
+        if QUALITY and event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+            Quality.cycle(manager, pacer)
+            if probe:
+                probe.done = True
+            continue
+        pacer.handle_event(event)
         manager.handle_event(event)
 
+    # unfocused: keep pumping events, skip the frame
+    if not pacer.rendering:
+        continue
+
     manager.update(dt)
+    if preloader:
+        preloader.update(manager.state)
+    if watcher:
+        watcher.update(manager.state)
     manager.draw(screen)
-    pygame.display.flip()
+    if capture:
+        capture.capture(backend or screen)
+
+    if backend:
+        backend.present()
+    elif DIRTY_RECTS:
+        rects = manager.dirty_rects()
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+    else:
+        pygame.display.flip()
+
+    if probe:
+        probe.record((time.perf_counter() - frame_start) * 1000)
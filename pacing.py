@@ -0,0 +1,110 @@
+import pygame
+import time
+from settings import *
+
+INPUT_EVENTS = {
+    pygame.KEYDOWN, pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+}
+
+
+class FramePacer:
+    """
+    Chooses the frame rate each tick.
+
+    - full FPS while the scene reports activity or input arrives
+    - IDLE_FPS after `idle_delay` seconds with nothing moving
+    - BACKGROUND_FPS, with no update/draw, while the window is unfocused
+
+    While throttled it sleeps in pygame.event.wait(), so input wakes it
+    immediately instead of at the next slow tick. With `adaptive=False`
+    it is a plain 60 FPS clock that still measures CPU use.
+    """
+
+    def __init__(self, fps=60, idle_fps=IDLE_FPS, background_fps=BACKGROUND_FPS,
+                 idle_delay=1.0, adaptive=ADAPTIVE_PACING):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.background_fps = background_fps
+        self.idle_delay = idle_delay
+        self.adaptive = adaptive
+
+        self.focused = True
+        self.idle_time = 0.0
+        self.current_fps = fps
+        self.last_tick = pygame.time.get_ticks()
+
+        # CPU accounting (process time per wall-clock second)
+        self.window_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.cpu_per_second = 0.0
+        self.frames = 0
+        self.frames_per_second = 0
+
+    # =========================
+    # INPUT
+    # =========================
+    def handle_event(self, event):
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+            self.wake()
+        elif event.type in INPUT_EVENTS:
+            self.wake()
+
+    def wake(self):
+        self.idle_time = 0.0
+
+    @property
+    def rendering(self):
+        return self.focused or not self.adaptive
+
+    # =========================
+    # TICK
+    # =========================
+    def tick(self, active=True):
+        """Wait for the next frame and return dt in seconds."""
+        if not self.adaptive:
+            fps = self.fps
+        elif not self.focused:
+            fps = self.background_fps
+        elif active or self.idle_time < self.idle_delay:
+            fps = self.fps
+        else:
+            fps = self.idle_fps
+
+        if fps < self.fps:
+            # sleep until the frame is due or input arrives
+            remaining = 1000 // fps - (pygame.time.get_ticks() - self.last_tick)
+            if remaining > 0:
+                event = pygame.event.wait(remaining)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)
+            dt = self.clock.tick() / 1000
+        else:
+            dt = self.clock.tick(fps) / 1000
+
+        self.last_tick = pygame.time.get_ticks()
+        self.current_fps = fps
+        self.idle_time = 0.0 if active else self.idle_time + dt
+        self.account()
+        return dt
+
+    def account(self):
+        self.frames += 1
+        elapsed = time.perf_counter() - self.window_start
+        if elapsed >= 1.0:
+            self.cpu_per_second = (time.process_time() - self.cpu_start) / elapsed
+            self.frames_per_second = round(self.frames / elapsed)
+            self.window_start = time.perf_counter()
+            self.cpu_start = time.process_time()
+            self.frames = 0
+
+    def summary(self):
+        return (
+            f"pacing: {self.current_fps} FPS target, {self.frames_per_second} FPS actual, "
+            f"{self.cpu_per_second:.1%} CPU"
+        )
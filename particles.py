@@ -0,0 +1,187 @@
+import pygame
+import numpy as np
+from itertools import repeat
+from settings import *
+
+# kind -> (colour, size in px, gravity px/s^2)
+KINDS = {
+    "spark": ((255, 190, 80), 3, 900),
+    "dust": ((120, 110, 100), 2, 60),
+    "data": ((0, 255, 100), 2, -40),
+}
+
+
+class ParticleSystem:
+    """
+    Particles stored as NumPy structure-of-arrays instead of sprites.
+
+    Live particles are packed at the front of the arrays ([:count]), so
+    integration, culling and drawing are whole-array operations. Each kind
+    is drawn with one pre-made square image in a single fblits call.
+    """
+
+    def __init__(self, capacity=40000, seed=None):
+        self.capacity = capacity
+        self.cap = capacity  # live limit, lowered by quality presets
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.kind_names = list(KINDS)
+        self.images = []
+        for colour, size, _ in KINDS.values():
+            image = pygame.Surface((size, size))
+            image.fill(colour)
+            self.images.append(image)
+
+        # stats for the last draw call
+        self.drawn = 0
+
+    def clear(self):
+        """Drop every live particle, keeping the buffers."""
+        self.alive[:self.count] = False
+        self.count = 0
+
+    # =========================
+    # EMIT
+    # =========================
+    def emit(self, kind, n, area, speed=(60, 240), angle=(0, 360), life=(0.4, 1.2)):
+        """Spawn up to `n` particles of `kind` at random points in `area`."""
+        n = min(n, min(self.cap, self.capacity) - self.count)
+        if n <= 0:
+            return 0
+
+        start, end = self.count, self.count + n
+        rng = self.rng
+        x, y, w, h = area
+        _, _, gravity = KINDS[kind]
+
+        self.pos[start:end, 0] = rng.uniform(x, x + w, n)
+        self.pos[start:end, 1] = rng.uniform(y, y + h, n)
+
+        theta = np.radians(rng.uniform(angle[0], angle[1], n))
+        velocity = rng.uniform(speed[0], speed[1], n)
+        self.vel[start:end, 0] = np.cos(theta) * velocity
+        self.vel[start:end, 1] = -np.sin(theta) * velocity
+
+        self.gravity[start:end] = gravity
+        self.life[start:end] = rng.uniform(life[0], life[1], n)
+        self.kind[start:end] = self.kind_names.index(kind)
+
+        self.count = end
+        return n
+
+    # =========================
+    # UPDATE
+    # =========================
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+
+        pos, vel, life = self.pos[:n], self.vel[:n], self.life[:n]
+
+        vel[:, 1] += self.gravity[:n] * dt
+        pos += vel * dt
+        life -= dt
+
+        # cull the dead in one compaction
+        alive = self.alive[:n]
+        np.greater(life, 0, out=alive)
+        survivors = int(np.count_nonzero(alive))
+        if survivors < n:
+            for array in (self.pos, self.vel, self.gravity, self.life, self.kind):
+                array[:survivors] = array[:n][alive]
+            self.count = survivors
+
+    # =========================
+    # DRAW
+    # =========================
+    def draw(self, surface, offset=(0, 0), scale=1):
+        n = self.count
+        self.drawn = 0
+        if not n:
+            return
+
+        width, height = surface.get_size()
+        screen = (self.pos[:n] - np.array(offset, dtype=np.float32)) / scale
+        on_screen = (
+            (screen[:, 0] > -8) & (screen[:, 0] < width)
+            & (screen[:, 1] > -8) & (screen[:, 1] < height)
+        )
+        kinds = self.kind[:n]
+
+        for index, image in enumerate(self.images):
+            mask = on_screen & (kinds == index)
+            points = screen[mask].astype(np.int32)
+            if len(points):
+                # flat lists zip into (x, y) pairs faster than a 2D tolist()
+                xs, ys = points[:, 0].tolist(), points[:, 1].tolist()
+                surface.fblits(zip(repeat(image), zip(xs, ys)))
+                self.drawn += len(xs)
+
+
+class Emitter:
+    """Continuous particle source, usually placed from a TMX object layer."""
+
+    def __init__(self, system, kind, area, rate=30):
+        self.system = system
+        self.kind = kind
+        self.area = area
+        self.rate = rate
+        self.carry = 0.0
+
+    @classmethod
+    def from_tmx(cls, obj, system):
+        """
+        Object name (or `kind` property) picks the particle kind,
+        `rate` property is particles per second.
+        """
+        props = getattr(obj, "properties", {}) or {}
+        kind = props.get("kind", obj.name)
+        if kind not in KINDS:
+            print(f"WARNING: Unknown particle kind '{kind}', using dust")
+            kind = "dust"
+
+        area = (obj.x, obj.y, obj.width or 1, obj.height or 1)
+        return cls(system, kind, area, float(props.get("rate", 30)))
+
+    def update(self, dt):
+        self.carry += self.rate * dt
+        n = int(self.carry)
+        if n:
+            self.carry -= n
+            self.system.emit(self.kind, n, self.area)
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(particles=30000, frames=120):
+    """Average ms per update+draw with `particles` alive on screen."""
+    import time
+
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    system = ParticleSystem(particles, seed=0)
+    area = (0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+    for kind in KINDS:
+        system.emit(kind, particles // len(KINDS), area, speed=(0, 20), life=(100, 200))
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        system.update(1 / 60)
+        system.draw(surface)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    for count in (10000, 30000):
+        print(f"particles: {count} -> {benchmark(count):.2f} ms/frame")
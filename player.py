@@ -1,6 +1,6 @@
 import pygame
-from os import walk
-from os.path import join
+from assets import Assets
+from assetpack import AssetPack
 
 GRAVITY = 2500
 JUMP_FORCE = -700
@@ -9,20 +9,98 @@ ANIMATION_SPEED = 30
 SCALE = 3
 
 
+class AnimationBank:
+    """
+    Player animation frames, loaded and scaled once per process.
+
+    Only the right-facing animations are stored; the left-facing ones
+    are their mirror images (the idle-l/left folders hold exactly that)
+    and are flipped at load time. Every animation also gets a
+    flash-tinted variant up front, so nothing is allocated while
+    animating. Frames are handed out as tuples and must not be drawn on.
+    """
+
+    BASE = "Images/player"
+    FOLDERS = {
+        "idle-right": "idle-r",
+        "right": "right",
+    }
+    # left-facing animation -> the animation it mirrors
+    MIRRORS = {
+        "idle-left": "idle-right",
+        "left": "right",
+    }
+
+    frames = {}
+
+    @classmethod
+    def load(cls):
+        if cls.frames:
+            return
+
+        for key, folder in cls.FOLDERS.items():
+            frames = cls.load_folder(folder)
+            cls.frames[(key, False)] = frames
+            cls.frames[(key, True)] = cls.tint(frames)
+
+        for key, source in cls.MIRRORS.items():
+            frames = tuple(
+                pygame.transform.flip(img, True, False) for img in cls.frames[(source, False)]
+            )
+            cls.frames[(key, False)] = frames
+            cls.frames[(key, True)] = cls.tint(frames)
+
+    @classmethod
+    def paths(cls, folder):
+        """Frame paths of one animation (Assets-relative), in frame order."""
+        files = AssetPack.listdir(f"{cls.BASE}/{folder}")
+        return [
+            f"{cls.BASE}/{folder}/{file}"
+            for file in sorted(files, key=lambda x: int(x.split(".")[0]))
+        ]
+
+    @classmethod
+    def load_folder(cls, folder):
+        # source frames come through Assets, which startup may have filled
+        return tuple(
+            pygame.transform.scale_by(Assets.get(path, alpha=True), SCALE)
+            for path in cls.paths(folder)
+        )
+
+    @staticmethod
+    def tint(frames):
+        tinted = []
+        for img in frames:
+            img = img.copy()
+            img.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_ADD)
+            tinted.append(img)
+        return tuple(tinted)
+
+    @classmethod
+    def get(cls, key, flash=False):
+        if not cls.frames:
+            cls.load()
+        return cls.frames[(key, flash)]
+
+
 class Player(pygame.sprite.Sprite):
     def __init__(self, pos, groups, collision_sprites):
         super().__init__(groups)
 
         self.collision_sprites = collision_sprites
-        self.flash_timer = 0
 
-        # animations
-        self.animations = self.load_animations()
+        # animations (shared, loaded on first use)
+        AnimationBank.load()
+        self.reset(pos)
+
+    def reset(self, pos):
+        """Back to a freshly spawned player at `pos` (see ScenePool)."""
+        self.flash_timer = 0
         self.state = "idle"
         self.facing = "right"
         self.frame_index = 0
 
-        self.image = self.animations["idle-right"][0]
+        self.image = AnimationBank.get("idle-right")[0]
         self.rect = self.image.get_rect(topleft=pos)
 
         # hitbox
@@ -36,28 +114,6 @@ class Player(pygame.sprite.Sprite):
         self.velocity_y = 0
         self.on_ground = False
 
-    # ------------------ ASSET LOADING ------------------
-
-    def load_animations(self):
-        animations = {}
-        base_path = join("", "assets", "images", "player")
-
-        for state in ["idle", "left", "right"]:
-            for direction in ["l", "r"]:
-                key = f"{state}-{'left' if direction == 'l' else 'right'}"
-                path = join(base_path, f"{state}-{direction}")
-                frames = []
-
-                for _, _, files in walk(path):
-                    for file in sorted(files, key=lambda x: int(x.split(".")[0])):
-                        image = pygame.image.load(join(path, file)).convert_alpha()
-                        image = pygame.transform.scale_by(image, SCALE)
-                        frames.append(image)
-
-                animations[key] = frames
-
-        return animations
-
     # ------------------ INPUT ------------------
 
     def input(self):
@@ -111,25 +167,6 @@ class Player(pygame.sprite.Sprite):
                     self.velocity_y = 0
 
     # ------------------ ANIMATION ------------------
-    def load_animations(self):
-        animations = {}
-        base = join("", "assets", "images", "player")
-
-        animations["idle-left"] = self.load_folder(join(base, "idle-l"))
-        animations["idle-right"] = self.load_folder(join(base, "idle-r"))
-        animations["left"] = self.load_folder(join(base, "left"))
-        animations["right"] = self.load_folder(join(base, "right"))
-
-        return animations
-
-    def load_folder(self, path):
-        frames = []
-        for _, _, files in walk(path):
-            for file in sorted(files):
-                img = pygame.image.load(join(path, file)).convert_alpha()
-                img = pygame.transform.scale_by(img, SCALE)
-                frames.append(img)
-        return frames
 
     def animate(self, dt):
         if self.direction.x < 0:
@@ -139,21 +176,28 @@ class Player(pygame.sprite.Sprite):
         else:
             key = f"idle-{self.facing}"
 
+        frames = AnimationBank.get(key, flash=self.flash_timer > 0)
+
         self.frame_index += ANIMATION_SPEED * dt
-        if self.frame_index >= len(self.animations[key]):
+        if self.frame_index >= len(frames):
             self.frame_index = 0
 
-        self.image = self.animations[key][int(self.frame_index)]
+        self.image = frames[int(self.frame_index)]
         self.rect.center = self.hitbox.center
-        if self.flash_timer > 0:
-            img = self.image.copy()
-            img.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_ADD)
-            self.image = img
 
     # ------------------ flash ------------------
     def flash(self, duration=250):
         self.flash_timer = duration
 
+    def is_moving(self):
+        # velocity_y flickers while standing (gravity vs. integer rects),
+        # so judge by whether the hitbox actually moved this frame
+        return bool(
+            self.direction.x
+            or self.hitbox != self.prev_hitbox
+            or self.flash_timer > 0
+        )
+
     # ------------------ UPDATE ------------------
 
     def update(self, dt):
@@ -0,0 +1,217 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os.path import join
+
+from settings import *
+from assets import Assets
+from baked_level import BakedLevel
+from flow import Flow
+from player import AnimationBank
+
+
+class Staging:
+    """
+    Loading work split by thread.
+
+    prepare() runs on any thread: it bakes/maps a scene's level and
+    decodes its images (declared ASSETS plus the level's tile sources).
+    Everything that needs the display - convert()/convert_alpha(),
+    scaling, cutting tiles out of the atlas - is queued and done on the
+    main thread by step(), within a time budget.
+    """
+
+    def __init__(self):
+        self.staged = queue.SimpleQueue()
+        self.tile_work = None
+
+        # stats
+        self.converted = 0
+        self.tiles_cut = 0
+
+    def prepare(self, scene_cls):
+        for path, alpha, size in getattr(scene_cls, "ASSETS", {}).values():
+            if not Assets.has(path, alpha, size):
+                self.staged.put(("image", path, alpha, size, Assets.decode(path)))
+
+        map_name = getattr(scene_cls, "MAP", None)
+        if map_name:
+            level = BakedLevel.load(join(ASSETS_DIR, "Maps", map_name))
+            for path in level.sources():
+                if not Assets.has(path, True):
+                    self.staged.put(("image", path, True, None, Assets.decode(path)))
+            self.staged.put(("tiles", level))
+
+    def step(self, deadline):
+        """Finish staged work until `deadline` (perf_counter); True once none is left."""
+        while time.perf_counter() < deadline:
+            if self.tile_work:
+                try:
+                    next(self.tile_work)
+                    self.tiles_cut += 1
+                except StopIteration:
+                    self.tile_work = None
+                continue
+
+            try:
+                item = self.staged.get_nowait()
+            except queue.Empty:
+                return True
+
+            if item[0] == "image":
+                _, path, alpha, size, image = item
+                Assets.adopt(path, alpha, image)
+                if size:
+                    Assets.get(path, alpha, size)
+                self.converted += 1
+            else:
+                level = item[1]
+                self.tile_work = (
+                    level.image(gid)
+                    for gid, source in enumerate(level.tile_sources) if source
+                )
+        return False
+
+
+class Preloader:
+    """
+    Prepares the scenes that can follow the current one while it plays.
+
+    A worker thread runs Staging.prepare() for the next scenes; the
+    display work it leaves is done in step(), a few milliseconds per
+    frame. When the transition later builds the scene, Assets and
+    BakedLevel already hold everything, so construction only creates
+    sprites.
+    """
+
+    def __init__(self, context, budget_ms=PRELOAD_BUDGET_MS):
+        self.context = context
+        self.budget = budget_ms / 1000
+        self.current = None
+        self.name = None
+        self.prepared = set()
+
+        self.requests = queue.SimpleQueue()
+        self.staging = Staging()
+
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+
+    # =========================
+    # MAIN THREAD
+    # =========================
+    def update(self, state):
+        """Call once per frame with the manager's current state."""
+        if state is not self.current:
+            self.current = state
+            self.name = Flow.name_of(state)
+        # polled every frame: what follows can change while a scene runs
+        # (level3 appears once level2 sets its choice); schedule() dedupes
+        if self.name:
+            self.schedule(Flow.upcoming(self.name, self.context))
+        self.step()
+
+    def schedule(self, names):
+        for name in names:
+            # level3 depends on the branch taken, so it is keyed by it
+            key = (name, self.context.flags.get("level2_choice") if name == "level3" else None)
+            if key not in self.prepared:
+                self.prepared.add(key)
+                self.requests.put(name)
+
+    def step(self):
+        self.staging.step(time.perf_counter() + self.budget)
+
+    def summary(self):
+        return (
+            f"preload: {self.staging.converted} images converted, "
+            f"{self.staging.tiles_cut} tiles cut ahead"
+        )
+
+    # =========================
+    # WORKER THREAD
+    # =========================
+    def _work(self):
+        while True:
+            name = self.requests.get()
+            try:
+                self.staging.prepare(Flow.scene(name))
+            except Exception as e:
+                # the scene will simply load normally
+                print(f"WARNING: Preloading {name} failed: {e}")
+
+
+# =========================
+# STARTUP
+# =========================
+def startup_paths(scene_classes):
+    """(path, alpha) of every image the first scenes and the player load."""
+    paths = {}
+    for folder in AnimationBank.FOLDERS.values():
+        for path in AnimationBank.paths(folder):
+            paths[path] = True
+
+    for scene_cls in scene_classes:
+        for path, alpha, _ in getattr(scene_cls, "ASSETS", {}).values():
+            paths[path] = alpha
+        map_name = getattr(scene_cls, "MAP", None)
+        if map_name:
+            level = BakedLevel.load(join(ASSETS_DIR, "Maps", map_name))
+            for path in level.sources():
+                paths[path] = True
+    return [(path, alpha) for path, alpha in paths.items() if not Assets.has(path, alpha)]
+
+
+def decode_all(paths, workers):
+    """Decode `paths` on a pool of `workers` threads (1 = serial, in place)."""
+    if workers == 1:
+        return [Assets.decode(path) for path in paths]
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(Assets.decode, paths))
+
+
+def warm_start(scene_classes, workers=None):
+    """
+    Decode the startup images on a thread pool (SDL_image runs without
+    the GIL), then convert them on the calling (main) thread.
+    """
+    paths = startup_paths(scene_classes)
+    workers = workers or min(8, os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    decoded = decode_all([path for path, _ in paths], workers)
+    wall = time.perf_counter() - started
+
+    for (path, alpha), image in zip(paths, decoded):
+        Assets.adopt(path, alpha, image)
+    return f"startup: {len(paths)} images decoded on {workers} threads in {wall * 1000:.0f} ms"
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(scene_classes, workers=(1, 2, 4, 8), rounds=3):
+    """Best-of-`rounds` wall-clock ms to decode the startup images per pool size."""
+    paths = [path for path, _ in startup_paths(scene_classes)]
+    results = {}
+    for count in workers:
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            decode_all(paths, count)
+            best = min(best, time.perf_counter() - started)
+        results[count] = best * 1000
+    return len(paths), results
+
+
+if __name__ == "__main__":
+    import pygame
+
+    pygame.init()
+    count, results = benchmark([Flow.scene("boot"), Flow.scene("level1")])
+    serial = results[1]
+    print(f"decoding {count} startup images ({os.cpu_count()} CPUs)")
+    for workers, ms in results.items():
+        print(f"  {workers} threads: {ms:6.1f} ms (saved {serial - ms:6.1f} ms)")
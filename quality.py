@@ -0,0 +1,144 @@
+import time
+from settings import *
+from render_target import RenderTarget
+
+ORDER = ["low", "medium", "high"]
+
+PRESETS = {
+    "low": {
+        "render_scale": 2,
+        "glitch_passes": (),
+        "particle_cap": 2000,
+        "decoration_density": 0.5,
+        "fps": 30,
+    },
+    "medium": {
+        "render_scale": 1,
+        "glitch_passes": ("scanlines", "noise"),
+        "particle_cap": 10000,
+        "decoration_density": 0.75,
+        "fps": 60,
+    },
+    "high": {
+        "render_scale": 1,
+        "glitch_passes": ("scanlines", "shift", "blocks", "noise"),
+        "particle_cap": 40000,
+        "decoration_density": 1.0,
+        "fps": 60,
+    },
+}
+
+
+class Quality:
+    """
+    Current quality preset, shared process-wide.
+
+    Scenes read values when they load (decoration density, particle cap);
+    set() also pushes the preset onto the running manager and pacer so
+    resolution, effect passes, particle cap and frame cap change at once,
+    and decoration density too in scenes that define apply_quality().
+    Other scenes pick a new density up the next time they are built.
+    """
+
+    name = "high"
+    preset = PRESETS["high"]
+
+    @classmethod
+    def get(cls, key):
+        return cls.preset[key]
+
+    @classmethod
+    def set(cls, name, manager=None, pacer=None):
+        cls.name = name
+        cls.preset = PRESETS[name]
+        if manager:
+            cls.apply(manager, pacer)
+        print(f"QUALITY: {name}")
+
+    @classmethod
+    def cycle(cls, manager=None, pacer=None):
+        name = ORDER[(ORDER.index(cls.name) + 1) % len(ORDER)]
+        cls.set(name, manager, pacer)
+
+    @classmethod
+    def apply(cls, manager, pacer=None):
+        preset = cls.preset
+
+        if pacer:
+            pacer.fps = preset["fps"]
+
+        # the SDL2 backend scales and composites on its own
+        if not manager.backend:
+            scale = preset["render_scale"]
+            if scale == 1:
+                manager.target = None
+            elif not manager.target or manager.target.scale != scale:
+                manager.target = RenderTarget(scale=scale)
+            manager.dirty.invalidate()
+
+        for effect in manager.effects:
+            effect.passes = preset["glitch_passes"]
+
+        particles = getattr(manager.state, "particles", None)
+        if particles:
+            particles.cap = preset["particle_cap"]
+
+        # decoration density is applied when a scene builds its map; scenes
+        # with apply_quality() rebuild their decorations now
+        apply = getattr(manager.state, "apply_quality", None)
+        if apply:
+            apply()
+
+    @classmethod
+    def keep_decoration(cls, obj):
+        """Deterministically thin out decorations by object id."""
+        density = cls.preset["decoration_density"]
+        if density >= 1:
+            return True
+        return (obj.id * 2654435761) % 1000 < density * 1000
+
+
+class QualityProbe:
+    """
+    Auto-detect: time the first seconds of play at each preset, from high
+    down, and settle on the first one whose frames fit the 60 FPS budget.
+
+    Each step changes what is timed even with GLITCH_EFFECTS off: the
+    presets also differ in decoration density, which the current scene
+    applies at once (apply_quality()).
+    """
+
+    def __init__(self, manager, pacer, window=3.0, budget_ms=1000 / 60 * 0.8):
+        self.manager = manager
+        self.pacer = pacer
+        self.window = window
+        self.budget_ms = budget_ms
+        self.done = False
+
+        Quality.set("high", manager, pacer)
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.samples = []
+
+    def record(self, work_ms):
+        """Feed the time one frame took, excluding the frame-cap sleep."""
+        if self.done:
+            return
+
+        self.samples.append(work_ms)
+        if time.perf_counter() - self.started < self.window:
+            return
+
+        # ignore the slowest tenth (scene loads, first texture uploads)
+        samples = sorted(self.samples)[:max(1, len(self.samples) * 9 // 10)]
+        average = sum(samples) / len(samples)
+        print(f"QUALITY PROBE: {Quality.name} averaged {average:.2f} ms/frame")
+
+        index = ORDER.index(Quality.name)
+        if average <= self.budget_ms or index == 0:
+            self.done = True
+        else:
+            Quality.set(ORDER[index - 1], self.manager, self.pacer)
+            self.reset()
@@ -0,0 +1,103 @@
+import pygame
+from settings import *
+
+
+class RenderTarget:
+    """
+    Off-screen canvas the world is drawn into at a fraction of the window
+    resolution, then scaled up to the window once per frame.
+
+    With `integer=True` the scale is rounded down to a whole number and the
+    image is letterboxed, so every source pixel becomes an exact block.
+    """
+
+    def __init__(self, window_size=(WINDOW_WIDTH, WINDOW_HEIGHT), scale=RENDER_SCALE, integer=INTEGER_SCALE):
+        width, height = window_size
+
+        if integer:
+            scale = max(1, int(scale))
+            canvas_size = (width // scale, height // scale)
+            output_size = (canvas_size[0] * scale, canvas_size[1] * scale)
+        else:
+            canvas_size = (round(width / scale), round(height / scale))
+            output_size = window_size
+
+        self.scale = scale
+        self.surface = pygame.Surface(canvas_size).convert()
+        self.output_rect = pygame.Rect((0, 0), output_size)
+        self.output_rect.center = (width // 2, height // 2)
+
+        self.window = None
+        self.window_size = None
+        self.output = None
+        self.bars = []
+
+    def present(self, window):
+        """Scale the canvas straight into the window (no temporary surface)."""
+        if window is not self.window or window.get_size() != self.window_size:
+            self.window = window
+            self.window_size = window.get_size()
+            self.output = window.subsurface(self.output_rect)
+
+            # letterbox: the window outside the output rect
+            width, height = self.window_size
+            out = self.output_rect
+            self.bars = [
+                rect for rect in (
+                    pygame.Rect(0, 0, width, out.top),
+                    pygame.Rect(0, out.bottom, width, height - out.bottom),
+                    pygame.Rect(0, out.top, out.left, out.height),
+                    pygame.Rect(out.right, out.top, width - out.right, out.height),
+                ) if rect.width > 0 and rect.height > 0
+            ]
+
+        # cleared every frame: transitions and overlays draw over the bars too
+        for bar in self.bars:
+            window.fill((0, 0, 0), bar)
+        pygame.transform.scale(self.surface, self.output_rect.size, self.output)
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(frames=300, scales=(1, 2, 3)):
+    """Time a tiled world + player through CameraGroup at each scale."""
+    import time
+    from camera import CameraGroup
+    from sprite import Sprite
+    from player import AnimationBank
+
+    window = pygame.display.get_surface()
+    tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+    tile.fill((40, 80, 40))
+    player = AnimationBank.get("idle-right")[0]
+
+    group = CameraGroup()
+    for x in range(40):
+        for y in range(24):
+            Sprite((x * TILE_SIZE, y * TILE_SIZE), tile, group)
+    hero = pygame.sprite.Sprite(group)
+    hero.image = player
+    hero.rect = player.get_rect(center=(WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    results = {}
+    for scale in scales:
+        target = RenderTarget(window.get_size(), scale) if scale > 1 else None
+        start = time.perf_counter()
+        for i in range(frames):
+            offset = (i % TILE_SIZE, 0)
+            if target:
+                group.draw(target.surface, offset, target.scale)
+                target.present(window)
+            else:
+                group.draw(window, offset)
+        results[scale] = (time.perf_counter() - start) / frames * 1000
+
+    return results
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    for scale, ms in benchmark().items():
+        print(f"RENDER_SCALE {scale}: {ms:.2f} ms/frame")
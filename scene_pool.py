@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from settings import *
+
+
+class ScenePool:
+    """
+    Scenes kept alive after they are left, one per scene class.
+
+    Scenes opt in by defining reset(): the manager parks a scene here
+    when it is replaced, and the next visit gets it back reset to its
+    initial state instead of rebuilding its map, sprites and player.
+    Scenes without reset() are always built from scratch.
+
+    The pool is bounded by count (SCENE_POOL) and by an estimate of what
+    its scenes hold (SCENE_POOL_MB); the least recently left scene goes
+    first.
+    """
+
+    def __init__(self, size=SCENE_POOL, budget_mb=SCENE_POOL_MB):
+        self.size = size
+        self.budget = budget_mb * 1024 * 1024
+        self.scenes = OrderedDict()   # scene class -> scene, least recent first
+
+        # stats
+        self.reused = 0
+        self.built = 0
+        self.evicted = 0
+
+    def get(self, scene_cls, manager, context):
+        """A `scene_cls` instance ready to enter."""
+        scene = self.scenes.pop(scene_cls, None)
+
+        if scene is None:
+            self.built += 1
+            return scene_cls(manager, context)
+
+        scene.manager = manager
+        scene.context = context
+        scene.reset()
+        self.reused += 1
+        return scene
+
+    def put(self, scene):
+        if not self.size or not hasattr(scene, "reset"):
+            return
+        self.scenes[type(scene)] = scene
+        self.scenes.move_to_end(type(scene))
+
+        while self.scenes and (
+            len(self.scenes) > self.size
+            or sum(map(self.footprint, self.scenes.values())) > self.budget
+        ):
+            self.scenes.popitem(last=False)
+            self.evicted += 1
+
+    @staticmethod
+    def footprint(scene):
+        """
+        Rough bytes a scene keeps alive: the surfaces of its sprites and
+        its NumPy buffers. Surfaces shared through Assets and tile caches
+        are counted too, so this errs high.
+        """
+        surfaces = {}
+        total = 0
+        for value in vars(scene).values():
+            if isinstance(value, pygame.sprite.AbstractGroup):
+                for sprite in value:
+                    image = getattr(sprite, "image", None)
+                    if image is not None:
+                        surfaces[id(image)] = image
+            elif hasattr(value, "__dict__"):
+                total += sum(
+                    array.nbytes for array in vars(value).values()
+                    if isinstance(array, np.ndarray)
+                )
+        return total + sum(s.get_pitch() * s.get_height() for s in surfaces.values())
+
+    def summary(self):
+        return (
+            f"scenes: {self.reused} reused, {self.built} built, {self.evicted} evicted, "
+            f"{len(self.scenes)} pooled"
+        )
@@ -1,25 +1,28 @@
 import pygame
-from pytmx.util_pygame import load_pygame
-import pytmx
 from settings import *
+from assets import Assets
+from baked_level import BakedLevel
 from player import Player
 from sprite import CollisionSprite
 from ai_ui import DialogueBox
-from fade import Fade
-# from scenes.level1_scene import Level1Scene
+from fonts import Fonts
 
 
 class BootScene:
+    MAP = "boot.tmx"
+    ASSETS = {
+        "terminal": ("Images/terminal/terminal.png", True, None),
+    }
+
     def __init__(self, manager, context):
         self.manager = manager
         self.context = context
 
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.SysFont("consolas", 20)
+        self.font = Fonts.get("mono", 20)
 
-        self.terminal_image = pygame.image.load(
-            join(ASSETS_DIR, "Images", "terminal", "terminal.png")
-        ).convert_alpha()
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.terminal_image = self.assets["terminal"]
 
         self.terminal_rect = None
         self.terminal_draw_rect = None
@@ -30,7 +33,6 @@ class BootScene:
 
         # state
         self.ui = DialogueBox()
-        self.fade = Fade((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.exiting = False
 
         # protocol tracking
@@ -40,6 +42,27 @@ class BootScene:
 
         self.load_map()
 
+    def reset(self):
+        """Back to the state a fresh scene starts in, for a revisit through the ScenePool."""
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.terminal_image = self.assets["terminal"]
+
+        self.ui = DialogueBox()
+        self.exiting = False
+
+        self.context.metrics["boot_start_time"] = pygame.time.get_ticks()
+        self.moved = False
+        self.interacted = False
+
+        level = BakedLevel.load(join(ASSETS_DIR, "Maps", self.MAP))
+        if level is not self.tmx:
+            self.all_sprites.empty()
+            self.collision_sprites.empty()
+            self.load_map()
+        else:
+            spawn = self.tmx.objects("player", "spawn")[-1]
+            self.player.reset((spawn.x, spawn.y))
+
     # =========================
     # TMX LOADING (ONLY OBJECT LAYERS)
     # =========================
@@ -48,8 +71,8 @@ class BootScene:
     # =========================
     def load_map(self):
         try:
-            self.tmx = load_pygame(
-                join(ASSETS_DIR, "Maps", "boot.tmx")
+            self.tmx = BakedLevel.load(
+                join(ASSETS_DIR, "Maps", self.MAP)
             )
         except Exception as e:
             print(f"Error loading map: {e}")
@@ -66,15 +89,10 @@ class BootScene:
              print("WARNING: No collision layer found in boot.tmx!")
         
         print(f"DEBUG: Loading collisions from layer '{layer_name}'")
-        found_collisions = False
-        try:
-            for obj in self.tmx.get_layer_by_name(layer_name):
-                found_collisions = True
-                print(f"DEBUG: Found Collision Obj: x={obj.x}, y={obj.y}, w={obj.width}, h={obj.height}, name={obj.name}")
-                rect = pygame.FRect(obj.x, obj.y, obj.width, obj.height)
-                CollisionSprite(rect, self.collision_sprites)
-        except Exception as e:
-             print(f"Collision loading warning: {e}")
+        for obj in self.tmx.objects(layer_name):
+            print(f"DEBUG: Found Collision Obj: x={obj.x}, y={obj.y}, w={obj.width}, h={obj.height}, name={obj.name}")
+        for rect in self.tmx.rects(layer_name).tolist():
+            CollisionSprite(pygame.FRect(rect), self.collision_sprites)
 
         # FORCE DEBUG FLOOR (Redundant safety)
         print("DEBUG: Adding Hardcoded Safety Floor at Y=650")
@@ -88,30 +106,28 @@ class BootScene:
 
         # ---------- PLAYER SPAWN ----------
         self.player = None
-        for obj in self.tmx.get_layer_by_name("player"):
-            if obj.name == "spawn":
-                print(f"DEBUG: Player Spawn found at ({obj.x}, {obj.y})")
-                self.player = Player(
-                    (obj.x, obj.y),
-                    self.all_sprites,
-                    self.collision_sprites
-                )
+        for obj in self.tmx.objects("player", "spawn"):
+            print(f"DEBUG: Player Spawn found at ({obj.x}, {obj.y})")
+            self.player = Player(
+                (obj.x, obj.y),
+                self.all_sprites,
+                self.collision_sprites
+            )
 
         if self.player is None:
             raise RuntimeError("BootScene: No player spawn found")
 
         # ---------- TERMINAL ----------
         self.terminal_rect = None
-        for obj in self.tmx.get_layer_by_name("terminal"):
-            if obj.name == "term-loc":
-                self.terminal_rect = pygame.Rect(
-                    obj.x, obj.y, obj.width, obj.height
-                )
+        for obj in self.tmx.objects("terminal", "term-loc"):
+            self.terminal_rect = pygame.Rect(
+                obj.x, obj.y, obj.width, obj.height
+            )
 
-                # visual rect (sprite aligned to bottom of interaction zone)
-                self.terminal_draw_rect = self.terminal_image.get_rect(
-                    midbottom=self.terminal_rect.midbottom
-                )
+            # visual rect (sprite aligned to bottom of interaction zone)
+            self.terminal_draw_rect = self.terminal_image.get_rect(
+                midbottom=self.terminal_rect.midbottom
+            )
 
         if self.terminal_rect is None:
             raise RuntimeError("BootScene: No terminal location found")
@@ -131,8 +147,7 @@ class BootScene:
             
             # EXIT if already interacted
             if self.interacted and event.key == pygame.K_RETURN:
-                 self.fade.start()
-                 self.exiting = True
+                 self.exit_scene()
 
             # terminal interaction
             if event.key == pygame.K_i:
@@ -185,11 +200,9 @@ class BootScene:
             self.player.rect.topleft = (100, 400)
             self.player.velocity_y = 0
 
-        if self.exiting and self.fade.update():
-            from scenes.level1_scene import Level1Scene
-            self.manager.change_state(
-                Level1Scene(self.manager, self.context)
-            )
+    def exit_scene(self):
+        self.exiting = True
+        self.manager.transition("level1", self.context)
 
     # =========================
     # DRAW
@@ -197,15 +210,12 @@ class BootScene:
     def draw(self, screen):
         screen.fill((10, 10, 15))
         # draw tile layers
-        for layer in self.tmx.visible_layers:
-            if isinstance(layer, pytmx.TiledTileLayer):
-                for x, y, gid in layer:
-                    tile = self.tmx.get_tile_image_by_gid(gid)
-                    if tile:
-                        screen.blit(
-                            tile,
-                            (x * self.tmx.tilewidth, y * self.tmx.tileheight)
-                        )
+        for layer in self.tmx.tile_layers:
+            for x, y, tile in self.tmx.tiles(layer):
+                screen.blit(
+                    tile,
+                    (x * self.tmx.tilewidth, y * self.tmx.tileheight)
+                )
         # terminal sprite
         if self.terminal_draw_rect:
             screen.blit(self.terminal_image, self.terminal_draw_rect)
@@ -225,5 +235,12 @@ class BootScene:
         if self.terminal_rect:
             pygame.draw.rect(screen, "green", self.terminal_rect, 2)
 
-        self.fade.draw(screen)
+    def dirty_rects(self):
+        """Screen regions changed by the last draw."""
+        rects = [self.player.rect]
+        if self.ui.dirty_rect:
+            rects.append(self.ui.dirty_rect)
+        return rects
 
+    def is_active(self):
+        return self.player.is_moving() or self.ui.is_typing()
@@ -1,15 +1,28 @@
 import pygame
 from os.path import join
-from pytmx.util_pygame import load_pygame
 
 from settings import *
+from assets import Assets
+from baked_level import BakedLevel
 from player import Player
-from sprite import Sprite, Decoration, CollisionSprite
-from fade import Fade
+from sprite import Sprite, Decoration, CollisionSprite, TransformCache
+from camera import CameraGroup
+from particles import ParticleSystem, Emitter
+from quality import Quality
+from streaming import LevelStream
 from ai_ui import DialogueBox
 import threading
 
 class Level1Scene:
+    MAP = "level1-final.tmx"
+    MAP_LAYERS = ("decorations", "Ground", "platforms")
+    # draw order of the map layers, under the player (z 0); explicit so a
+    # layer rebuilt later (hot reload, quality change) keeps its place
+    LAYER_Z = {"decorations": -2, "Ground": -1}
+    ASSETS = {
+        "bg": ("Graphics/bg/bg.png", False, (WINDOW_WIDTH, WINDOW_HEIGHT)),
+    }
+
     def __init__(self, manager, context):
         print("LEVEL 1 LOADED")
         self.manager = manager
@@ -17,21 +30,21 @@ class Level1Scene:
 
         self.display_surface = pygame.display.get_surface()
         self.camera_offset = pygame.Vector2(0, 0)
+        self.drawn_offset = pygame.Vector2(0, 0)
+        self.scrolled = True
+        self.reloaded = False
 
         # groups
-        self.all_sprites = pygame.sprite.Group()
+        self.all_sprites = CameraGroup()
         self.collision_sprites = pygame.sprite.Group()
+        self.particles = ParticleSystem()
+        self.particles.cap = Quality.get("particle_cap")
 
         # background
-        self.bg = pygame.image.load(
-            join(ASSETS_DIR, "Graphics", "bg", "bg.png")
-        ).convert()
-        self.bg = pygame.transform.scale(
-            self.bg, (WINDOW_WIDTH, WINDOW_HEIGHT)
-        )
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.bg = self.assets["bg"]
 
         # state
-        self.fade = Fade((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.exiting = False
         
         # UI
@@ -42,6 +55,45 @@ class Level1Scene:
         # Trigger Briefing
         self.trigger_ai_response(self.context.ai.generate_mission_briefing, "Sector 4 - Identifying Anomalies")
 
+    def reset(self):
+        """
+        Back to the state a fresh scene starts in, for a revisit through
+        the ScenePool. Sprites are kept; the map is only rebuilt where the
+        TMX changed since the last visit.
+        """
+        print("LEVEL 1 REUSED")
+        self.camera_offset.update(0, 0)
+        self.drawn_offset.update(0, 0)
+        self.scrolled = True
+        self.reloaded = False
+        self.exiting = False
+
+        self.particles.clear()
+        self.particles.cap = Quality.get("particle_cap")
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.bg = self.assets["bg"]
+        self.ui = DialogueBox()
+
+        level = BakedLevel.load(join(ASSETS_DIR, "Maps", self.MAP))
+        if self.stream:
+            self.level = level
+            self.stream.clear()
+            self.stream = LevelStream(level, self.all_sprites, self.collision_sprites)
+        elif level is not self.level:
+            self.reload(level)
+        self.apply_quality()
+        self.build_emitters(self.level)
+
+        spawn = self.level.objects("player", "spawn")[-1]
+        self.player.reset((spawn.x, spawn.y))
+
+        self.trigger_ai_response(self.context.ai.generate_mission_briefing, "Sector 4 - Identifying Anomalies")
+
+    def exit(self):
+        if self.stream:
+            print(self.stream.summary())
+            self.stream.stop()
+
     def trigger_ai_response(self, func, *args):
         """Helper to run AI calls in a separate thread."""
         def wrapper():
@@ -60,48 +112,153 @@ class Level1Scene:
     # MAP SETUP (UNCHANGED LOGIC)
     # =========================
     def setup(self):
-        tmx_map = load_pygame(
-            join(ASSETS_DIR, "Maps", "level1-final.tmx")
+        level = self.level = BakedLevel.load(
+            join(ASSETS_DIR, "Maps", self.MAP)
         )
 
+        self.stream = None
+        self.layer_sprites = {}
+        self.density = Quality.get("decoration_density")
+        if STREAMING:
+            # tiles, decorations and platforms come in chunk by chunk
+            self.stream = LevelStream(
+                level, self.all_sprites, self.collision_sprites
+            )
+        else:
+            self.build_map(level)
+
+        # Player spawn
+        self.player = None
+        for obj in level.objects("player", "spawn"):
+            self.player = Player(
+                (obj.x, obj.y),
+                self.all_sprites,
+                self.collision_sprites
+            )
+
+        if self.player is None:
+            raise RuntimeError("No player spawn found in level1 TMX")
+
+        # Particle emitters (optional layer)
+        self.build_emitters(level)
+
+    def build_map(self, level):
+        # sprites are kept per layer so a hot reload can rebuild one of them
+        for name in self.MAP_LAYERS:
+            self.layer_sprites[name] = self.build_layer(level, name)
+
+    def build_layer(self, level, name):
+        sprites = []
+
         # Decorations
-        for obj in tmx_map.get_layer_by_name("decorations"):
-            Decoration.from_tmx(obj, self.all_sprites)
+        if name == "decorations":
+            TransformCache.reset_stats()
+            for obj in level.objects("decorations"):
+                if Quality.keep_decoration(obj):
+                    sprites.append(Decoration.from_tmx(obj, ()))
+            print(TransformCache.report())
 
         # Ground tiles
-        for x, y, image in tmx_map.get_layer_by_name("Ground").tiles():
-            Sprite(
-                (x * TILE_SIZE, y * TILE_SIZE),
-                image,
-                self.all_sprites
+        elif name == "Ground":
+            for x, y, image in level.tiles("Ground"):
+                sprites.append(Sprite(
+                    (x * TILE_SIZE, y * TILE_SIZE),
+                    image,
+                    ()
+                ))
+
+        # Platforms (collision, baked as bounding rects)
+        elif name == "platforms":
+            for rect in level.rects("platforms").tolist():
+                sprites.append(CollisionSprite(pygame.FRect(rect), self.collision_sprites))
+
+        sprites = [sprite for sprite in sprites if sprite]
+        if name in self.LAYER_Z:
+            # z is read when a sprite joins the group, so set it first
+            for sprite in sprites:
+                sprite.z = self.LAYER_Z[name]
+            self.all_sprites.add(sprites)
+        return sprites
+
+    def build_emitters(self, level):
+        self.emitters = [
+            Emitter.from_tmx(obj, self.particles) for obj in level.objects("particles")
+        ]
+
+    def apply_quality(self):
+        """Rethin the decorations when the preset's density changed (F2, auto probe)."""
+        density = Quality.get("decoration_density")
+        if density == self.density:
+            return
+        self.density = density
+
+        if self.stream:
+            self.stream.clear()
+            self.stream = LevelStream(
+                self.level, self.all_sprites, self.collision_sprites
             )
+        else:
+            for sprite in self.layer_sprites["decorations"]:
+                sprite.kill()
+            self.layer_sprites["decorations"] = self.build_layer(self.level, "decorations")
 
-        # Platforms (collision)
-        for obj in tmx_map.get_layer_by_name("platforms"):
-            points = obj.as_points
-            xs = [p[0] for p in points]
-            ys = [p[1] for p in points]
-
-            rect = pygame.FRect(
-                min(xs),
-                min(ys),
-                max(xs) - min(xs),
-                max(ys) - min(ys)
+    def reload(self, level):
+        """
+        Swap in a rebaked level (see hot_reload.py), rebuilding only the
+        layers that changed. The player, the context and everything else
+        in the scene stay as they are.
+        """
+        changed = level.changed_layers(self.level)
+        self.level = level
+
+        if self.stream:
+            self.stream.clear()
+            self.stream = LevelStream(
+                level, self.all_sprites, self.collision_sprites
             )
-            CollisionSprite(rect, self.collision_sprites)
+        else:
+            for name in changed & set(self.MAP_LAYERS):
+                for sprite in self.layer_sprites[name]:
+                    sprite.kill()
+                self.layer_sprites[name] = self.build_layer(level, name)
 
-        # Player spawn
-        self.player = None
-        for obj in tmx_map.get_layer_by_name("player"):
-            if obj.name == "spawn":
-                self.player = Player(
-                    (obj.x, obj.y),
-                    self.all_sprites,
-                    self.collision_sprites
-                )
+        if "particles" in changed:
+            self.build_emitters(level)
 
-        if self.player is None:
-            raise RuntimeError("No player spawn found in level1 TMX")
+        self.reloaded = True
+        return changed
+
+    def verify(self):
+        """
+        Sprites that differ from a fresh build of the current level (hot
+        reload check; 0 when reload() kept them right): decorations with a
+        different image, and map sprites drawn out of layer order.
+        """
+        if self.stream:
+            return 0
+        objects = [
+            obj for obj in self.level.objects("decorations")
+            if Quality.keep_decoration(obj) and obj.image
+        ]
+        sprites = self.layer_sprites["decorations"]
+        if len(objects) != len(sprites):
+            return abs(len(objects) - len(sprites))
+        stale = sum(
+            pygame.image.tobytes(sprite.image, "RGBA")
+            != pygame.image.tobytes(Decoration.transform(obj), "RGBA")
+            for obj, sprite in zip(objects, sprites)
+        )
+
+        # decorations, then ground tiles, then the player
+        rank = {self.player: len(self.LAYER_Z)}
+        for index, name in enumerate(self.LAYER_Z):
+            rank.update(dict.fromkeys(self.layer_sprites[name], index))
+        highest = 0
+        for sprite in sorted(rank, key=self.all_sprites.order.__getitem__):
+            if rank[sprite] < highest:
+                stale += 1
+            highest = max(highest, rank[sprite])
+        return stale
 
     # =========================
     # INPUT
@@ -113,8 +270,7 @@ class Level1Scene:
         if event.type == pygame.KEYDOWN:
             # TEMP EXIT CONDITION (replace with cache objective later)
             if event.key == pygame.K_RETURN:
-                self.fade.start()
-                self.exiting = True
+                self.exit_scene()
             
             # AI Testing Keys
             elif event.key == pygame.K_t:
@@ -136,7 +292,15 @@ class Level1Scene:
     # UPDATE
     # =========================
     def update(self, dt):
+        if self.stream:
+            # collision around the player must exist before it moves
+            view = pygame.Rect(self.camera_offset, (WINDOW_WIDTH, WINDOW_HEIGHT))
+            self.stream.update(self.player.rect, view)
+
         self.all_sprites.update(dt)
+        for emitter in self.emitters:
+            emitter.update(dt)
+        self.particles.update(dt)
         self.ui.update()
 
         # camera follow
@@ -147,33 +311,52 @@ class Level1Scene:
             self.player.rect.centery - WINDOW_HEIGHT // 2
         )
 
-        # exit transition
-        if self.exiting and self.fade.update():
-            from scenes.boot_scene import BootScene
-            self.manager.change_state(
-                BootScene(self.manager, self.context)
-            )
+    def exit_scene(self):
+        self.exiting = True
+        self.manager.transition("boot", self.context)
 
     # =========================
     # DRAW
     # =========================
     def draw(self, screen):
+        self.draw_world(screen)
+        self.draw_ui(screen)
+
+    def draw_world(self, surface, scale=1):
         # background (no parallax for now)
-        screen.blit(self.bg, (0, 0))
+        if self.bg.get_size() != surface.get_size():
+            self.bg = Assets.get("Graphics/bg/bg.png", size=surface.get_size())
+        surface.blit(self.bg, (0, 0))
 
         # world
-        for sprite in self.all_sprites:
-            offset_rect = sprite.rect.copy()
-            offset_rect.topleft -= self.camera_offset
-            screen.blit(sprite.image, offset_rect)
+        self.all_sprites.draw(surface, self.camera_offset, scale)
+        self.particles.draw(surface, self.camera_offset, scale)
+        self.scrolled = self.camera_offset != self.drawn_offset or self.reloaded
+        self.reloaded = False
+        self.drawn_offset.update(self.camera_offset)
 
         # DEBUG COLLISIONS (optional)
         # for sprite in self.collision_sprites:
         #     rect = sprite.rect.copy()
         #     rect.topleft -= self.camera_offset
         #     pygame.draw.rect(screen, "red", rect, 2)
-            
-        # Draw UI
+
+    def draw_ui(self, screen):
         self.ui.draw(screen)
 
-        self.fade.draw(screen)
+    def dirty_rects(self):
+        """Screen regions changed by the last draw (None = whole frame)."""
+        if self.scrolled or self.particles.count:
+            return None
+
+        rects = [self.player.rect.move(-self.drawn_offset)]
+        if self.ui.dirty_rect:
+            rects.append(self.ui.dirty_rect)
+        return rects
+
+    def is_active(self):
+        return (
+            self.player.is_moving()
+            or self.ui.is_typing()
+            or self.particles.count > 0
+        )
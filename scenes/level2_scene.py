@@ -1,17 +1,21 @@
 import pygame
 from os.path import join
-from pytmx.util_pygame import load_pygame
-import pytmx
 
 from settings import *
+from assets import Assets
+from baked_level import BakedLevel
 from player import Player
-from sprite import Sprite, Decoration, CollisionSprite
-from fade import Fade
+from sprite import CollisionSprite
 from ai_ui import DialogueBox
 import threading
 
 
 class Level2Scene:
+    MAP = "level2.tmx"
+    ASSETS = {
+        "bg": ("Graphics/bg/bg.png", False, (WINDOW_WIDTH, WINDOW_HEIGHT)),
+    }
+
     def __init__(self, manager, context):
         print("LEVEL 2 LOADED")
 
@@ -25,15 +29,10 @@ class Level2Scene:
         self.collision_sprites = pygame.sprite.Group()
 
         # background
-        self.bg = pygame.image.load(
-            join(ASSETS_DIR, "Graphics", "bg", "bg.png")
-        ).convert()
-        self.bg = pygame.transform.scale(
-            self.bg, (WINDOW_WIDTH, WINDOW_HEIGHT)
-        )
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.bg = self.assets["bg"]
 
         # state
-        self.fade = Fade((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.exiting = False
         
         # UI
@@ -65,42 +64,30 @@ class Level2Scene:
 
     # ------------------
     def load_map(self):
-        self.tmx = load_pygame(join(ASSETS_DIR, "Maps", "level2.tmx"))
+        self.tmx = BakedLevel.load(join(ASSETS_DIR, "Maps", self.MAP))
 
         self.survivor_rect = None
         self.data_rect = None
         self.exit_rect = None
 
-        for layer in self.tmx.layers:
-            if isinstance(layer, pytmx.TiledObjectGroup):
-                for obj in layer:
-                    if layer.name == "platform":
-                        CollisionSprite(
-                            pygame.FRect(obj.x, obj.y, obj.width, obj.height),
-                            self.collision_sprites
-                        )
-
-                    elif layer.name == "player" and obj.name == "spawn":
-                        self.player = Player(
-                            (obj.x, obj.y),
-                            self.all_sprites,
-                            self.collision_sprites
-                        )
-
-                    elif layer.name == "survivor":
-                        self.survivor_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
-
-                    elif layer.name == "data":
-                        self.data_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
-
-                    elif layer.name == "exit":
-                        self.exit_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
+        for rect in self.tmx.rects("platform").tolist():
+            CollisionSprite(pygame.FRect(rect), self.collision_sprites)
+
+        for obj in self.tmx.objects("player", "spawn"):
+            self.player = Player(
+                (obj.x, obj.y),
+                self.all_sprites,
+                self.collision_sprites
+            )
+
+        for obj in self.tmx.objects("survivor"):
+            self.survivor_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+
+        for obj in self.tmx.objects("data"):
+            self.data_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+
+        for obj in self.tmx.objects("exit"):
+            self.exit_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
 
     # ------------------
     def handle_event(self, event):
@@ -158,14 +145,11 @@ class Level2Scene:
             self.player.rect.centery - WINDOW_HEIGHT // 2
         )
 
-        # exit transition
-        if self.exiting and self.fade.update():
-            # FOR NOW, LOOP BACK TO BOOT
-            # LATER: Go to Level 3 or Main Menu
-            from scenes.boot_scene import BootScene
-            self.manager.change_state(
-                BootScene(self.manager, self.context)
-            )
+    def exit_scene(self):
+        # FOR NOW, LOOP BACK TO BOOT
+        # LATER: Go to Level 3 or Main Menu
+        self.exiting = True
+        self.manager.transition("boot", self.context)
 
     # =========================
     # DRAW
@@ -177,5 +161,3 @@ class Level2Scene:
 
         if self.dialogue:
             self.dialogue.draw(screen)
-
-        self.fade.draw(screen)
@@ -1,17 +1,21 @@
 import pygame
 from os.path import join
-from pytmx.util_pygame import load_pygame
-import pytmx
 
 from settings import *
+from assets import Assets
+from baked_level import BakedLevel
 from player import Player
-from sprite import Sprite, Decoration, CollisionSprite
-from fade import Fade
+from sprite import CollisionSprite
 from ai_ui import DialogueBox
 import threading
 
 
 class Level3Scene:
+    MAP = "level3.tmx"
+    ASSETS = {
+        "bg": ("Graphics/bg/bg.png", False, (WINDOW_WIDTH, WINDOW_HEIGHT)),
+    }
+
     def __init__(self, manager, context):
         print("LEVEL 3 LOADED")
         self.manager = manager
@@ -25,15 +29,10 @@ class Level3Scene:
         self.collision_sprites = pygame.sprite.Group()
 
         # background
-        self.bg = pygame.image.load(
-            join(ASSETS_DIR, "Graphics", "bg", "bg.png")
-        ).convert()
-        self.bg = pygame.transform.scale(
-            self.bg, (WINDOW_WIDTH, WINDOW_HEIGHT)
-        )
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.bg = self.assets["bg"]
 
         # state
-        self.fade = Fade((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.exiting = False
         
         # UI
@@ -65,42 +64,30 @@ class Level3Scene:
 
     # ------------------
     def load_map(self):
-        self.tmx = load_pygame(join(ASSETS_DIR, "Maps", "level3.tmx"))
+        self.tmx = BakedLevel.load(join(ASSETS_DIR, "Maps", self.MAP))
 
         self.escort_rect = None
         self.node_rect = None
         self.exit_rect = None
 
-        for layer in self.tmx.layers:
-            if isinstance(layer, pytmx.TiledObjectGroup):
-                for obj in layer:
-                    if layer.name == "platform":
-                        CollisionSprite(
-                            pygame.FRect(obj.x, obj.y, obj.width, obj.height),
-                            self.collision_sprites
-                        )
-
-                    elif layer.name == "player" and obj.name == "spawn":
-                        self.player = Player(
-                            (obj.x, obj.y),
-                            self.all_sprites,
-                            self.collision_sprites
-                        )
-
-                    elif layer.name == "escort":
-                        self.escort_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
-
-                    elif layer.name == "node":
-                        self.node_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
-
-                    elif layer.name == "exit":
-                        self.exit_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
+        for rect in self.tmx.rects("platform").tolist():
+            CollisionSprite(pygame.FRect(rect), self.collision_sprites)
+
+        for obj in self.tmx.objects("player", "spawn"):
+            self.player = Player(
+                (obj.x, obj.y),
+                self.all_sprites,
+                self.collision_sprites
+            )
+
+        for obj in self.tmx.objects("escort"):
+            self.escort_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+
+        for obj in self.tmx.objects("node"):
+            self.node_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+
+        for obj in self.tmx.objects("exit"):
+            self.exit_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
 
     # ------------------
     def handle_event(self, event):
@@ -139,8 +126,7 @@ class Level3Scene:
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
-                self.fade.start()
-                self.exiting = True
+                self.exit_scene()
                 
             # AI Testing Keys
             elif event.key == pygame.K_t:
@@ -183,12 +169,9 @@ class Level3Scene:
             self.player.rect.centery - WINDOW_HEIGHT // 2
         )
 
-        # exit transition
-        if self.exiting and self.fade.update():
-            from scenes.boot_scene import BootScene
-            self.manager.change_state(
-                BootScene(self.manager, self.context)
-            )
+    def exit_scene(self):
+        self.exiting = True
+        self.manager.transition("boot", self.context)
 
     # =========================
     # DRAW
@@ -198,23 +181,17 @@ class Level3Scene:
         screen.blit(self.bg, (0, 0))
 
         # world
-        for layer in self.tmx.visible_layers: # Kept TMX drawing
-            if isinstance(layer, pytmx.TiledTileLayer):
-                for x, y, gid in layer:
-                    tile = self.tmx.get_tile_image_by_gid(gid)
-                    if tile:
-                        screen.blit(
-                            tile,
-                            (x * self.tmx.tilewidth, y * self.tmx.tileheight)
-                        )
+        for layer in self.tmx.tile_layers: # Kept TMX drawing
+            for x, y, tile in self.tmx.tiles(layer):
+                screen.blit(
+                    tile,
+                    (x * self.tmx.tilewidth, y * self.tmx.tileheight)
+                )
 
         self.all_sprites.draw(screen)
         
         self.ui.draw(screen)
-        self.fade.draw(screen)
         if self.branch == "survivor":
             pygame.draw.rect(screen, "green", self.escort_rect, 2)
         else:
             self.dialogue.draw(screen)
-
-        self.fade.draw(screen)
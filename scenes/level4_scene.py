@@ -1,17 +1,26 @@
 import pygame
 from os.path import join
-from pytmx.util_pygame import load_pygame
-import pytmx
 
 from settings import *
+from assets import Assets
+from baked_level import BakedLevel
 from player import Player
-from sprite import Sprite, Decoration, CollisionSprite
-from fade import Fade
+from sprite import CollisionSprite
+from camera import CameraGroup
+from particles import ParticleSystem, Emitter
+from quality import Quality
 from ai_ui import DialogueBox
+from ui.dialogue import DialogueBox as ScriptedDialogue
+from fonts import Fonts
 import threading
 
 
 class Level4Scene:
+    MAP = "level4.tmx"
+    ASSETS = {
+        "bg": ("Graphics/bg/bg.png", False, (WINDOW_WIDTH, WINDOW_HEIGHT)),
+    }
+
     def __init__(self, manager, context):
         print("LEVEL 4 LOADED")
 
@@ -19,22 +28,22 @@ class Level4Scene:
         self.context = context
         self.display_surface = pygame.display.get_surface()
         self.camera_offset = pygame.Vector2(0, 0)
-        self.font = pygame.font.SysFont("consolas", 18)
+        self.drawn_offset = pygame.Vector2(0, 0)
+        self.scrolled = True
+        self.font = Fonts.get("mono", 18)
 
         # groups
-        self.all_sprites = pygame.sprite.Group()
+        self.all_sprites = CameraGroup()
         self.collision_sprites = pygame.sprite.Group()
+        self.particles = ParticleSystem()
+        self.particles.cap = Quality.get("particle_cap")
+        self.emitters = []
 
         # background
-        self.bg = pygame.image.load(
-            join(ASSETS_DIR, "Graphics", "bg", "bg.png")
-        ).convert()
-        self.bg = pygame.transform.scale(
-            self.bg, (WINDOW_WIDTH, WINDOW_HEIGHT)
-        )
+        self.assets = Assets.acquire(self, self.ASSETS)
+        self.bg = self.assets["bg"]
 
         # state
-        self.fade = Fade((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.exiting = False
         self.decision_made = False
 
@@ -68,37 +77,29 @@ class Level4Scene:
     # MAP LOADING
     # =====================
     def load_map(self):
-        self.tmx = load_pygame(join(ASSETS_DIR, "Maps", "level4.tmx"))
+        self.tmx = BakedLevel.load(join(ASSETS_DIR, "Maps", self.MAP))
 
         self.grant_rect = None
         self.shutdown_rect = None
 
-        for layer in self.tmx.layers:
-            if isinstance(layer, pytmx.TiledObjectGroup):
-                for obj in layer:
-
-                    if layer.name == "platform":
-                        CollisionSprite(
-                            pygame.FRect(obj.x, obj.y, obj.width, obj.height),
-                            self.collision_sprites
-                        )
-
-                    elif layer.name == "player" and obj.name == "spawn":
-                        self.player = Player(
-                            (obj.x, obj.y),
-                            self.all_sprites,
-                            self.collision_sprites
-                        )
-
-                    elif layer.name == "grant" and obj.name == "auth_key":
-                        self.grant_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
-
-                    elif layer.name == "shutdown" and obj.name == "kill_switch":
-                        self.shutdown_rect = pygame.Rect(
-                            obj.x, obj.y, obj.width, obj.height
-                        )
+        for rect in self.tmx.rects("platform").tolist():
+            CollisionSprite(pygame.FRect(rect), self.collision_sprites)
+
+        for obj in self.tmx.objects("player", "spawn"):
+            self.player = Player(
+                (obj.x, obj.y),
+                self.all_sprites,
+                self.collision_sprites
+            )
+
+        for obj in self.tmx.objects("grant", "auth_key"):
+            self.grant_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+
+        for obj in self.tmx.objects("shutdown", "kill_switch"):
+            self.shutdown_rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+
+        for obj in self.tmx.objects("particles"):
+            self.emitters.append(Emitter.from_tmx(obj, self.particles))
 
         if not self.grant_rect or not self.shutdown_rect:
             raise RuntimeError("Level4Scene: Missing terminal objects")
@@ -118,7 +119,7 @@ class Level4Scene:
                 "I can preserve all of it."
             ]
 
-        self.dialogue = DialogueBox(lines, self.font)
+        self.dialogue = ScriptedDialogue(lines, self.font)
 
     # =========================
     # INPUT
@@ -130,8 +131,7 @@ class Level4Scene:
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
-                self.fade.start()
-                self.exiting = True
+                self.exit_scene()
                 
             # AI Testing Keys
             elif event.key == pygame.K_t:
@@ -166,7 +166,7 @@ class Level4Scene:
         self.decision_made = True
         self.context.flags["level4_decision"] = "grant"
 
-        self.dialogue = DialogueBox(
+        self.dialogue = ScriptedDialogue(
             [
                 "The directive was never missing.",
                 "It was undefined."
@@ -181,7 +181,7 @@ class Level4Scene:
         self.decision_made = True
         self.context.flags["level4_decision"] = "terminate"
 
-        self.dialogue = DialogueBox(
+        self.dialogue = ScriptedDialogue(
             [
                 "Directive termination acknowledged."
             ],
@@ -193,7 +193,12 @@ class Level4Scene:
     # =========================
     def update(self, dt):
         self.all_sprites.update(dt)
+        for emitter in self.emitters:
+            emitter.update(dt)
+        self.particles.update(dt)
         self.ui.update()
+        if self.dialogue:
+            self.dialogue.update()
 
         # camera follow
         self.camera_offset.x = (
@@ -203,34 +208,55 @@ class Level4Scene:
             self.player.rect.centery - WINDOW_HEIGHT // 2
         )
 
-        # exit transition
-        if self.exiting and self.fade.update():
-            from scenes.boot_scene import BootScene
-            self.manager.change_state(
-                BootScene(self.manager, self.context)
-            )
+    def exit_scene(self):
+        self.exiting = True
+        self.manager.transition("boot", self.context)
 
     # =========================
     # DRAW
     # =========================
     def draw(self, screen):
+        self.draw_world(screen)
+        self.draw_ui(screen)
+
+    def draw_world(self, surface, scale=1):
         # background
-        screen.blit(self.bg, (0, 0))
+        if self.bg.get_size() != surface.get_size():
+            self.bg = Assets.get("Graphics/bg/bg.png", size=surface.get_size())
+        surface.blit(self.bg, (0, 0))
 
         # world
-        for sprite in self.all_sprites:
-            offset_rect = sprite.rect.copy()
-            offset_rect.topleft -= self.camera_offset
-            screen.blit(sprite.image, offset_rect)
-            
-        self.ui.draw(screen)
-        self.fade.draw(screen)
+        self.all_sprites.draw(surface, self.camera_offset, scale)
+        self.particles.draw(surface, self.camera_offset, scale)
+        self.scrolled = self.camera_offset != self.drawn_offset
+        self.drawn_offset.update(self.camera_offset)
 
         # DEBUG TERMINALS (remove later)
         # pygame.draw.rect(screen, "green", self.grant_rect, 2)
         # pygame.draw.rect(screen, "red", self.shutdown_rect, 2)
 
+    def draw_ui(self, screen):
+        self.ui.draw(screen)
+
         if self.dialogue:
             self.dialogue.draw(screen)
 
-        self.fade.draw(screen)
+    def dirty_rects(self):
+        """Screen regions changed by the last draw (None = whole frame)."""
+        if self.scrolled or self.particles.count:
+            return None
+
+        rects = [self.player.rect.move(-self.drawn_offset)]
+        if self.ui.dirty_rect:
+            rects.append(self.ui.dirty_rect)
+        if self.dialogue and self.dialogue.dirty_rect:
+            rects.append(self.dialogue.dirty_rect)
+        return rects
+
+    def is_active(self):
+        return (
+            self.player.is_moving()
+            or self.ui.is_typing()
+            or bool(self.dialogue and self.dialogue.is_typing())
+            or self.particles.count > 0
+        )
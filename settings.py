@@ -11,3 +11,39 @@ TILE_SIZE = 64
 
 TEXT_SPEED = 35        # typewriter speed (ms)
 FADE_SPEED = 12
+
+DIRTY_RECTS = False    # push only changed screen regions instead of flipping
+
+RENDER_SCALE = 1       # draw the world at 1/N window resolution, upscale once
+INTEGER_SCALE = True   # round RENDER_SCALE down to a whole number
+
+RENDER_BACKEND = "surface"  # "surface" (software blits) or "sdl2" (Renderer/Texture)
+
+ADAPTIVE_PACING = False  # drop to IDLE_FPS when nothing moves, pause when unfocused
+IDLE_FPS = 15
+BACKGROUND_FPS = 5
+
+GLITCH_EFFECTS = False  # scanlines / channel shift / noise post-process (needs numpy)
+
+QUALITY = None         # None (use the settings above), "low", "medium", "high" or "auto"; F2 cycles
+
+ASSET_CACHE_MB = 64    # unreferenced surfaces kept around for later scenes
+SCENE_POOL = 3         # scenes kept built for revisits (0 rebuilds every time)
+SCENE_POOL_MB = 64     # rough memory bound for pooled scenes
+ASSET_PACK = join(BASE_DIR, "assets.pak")  # packed assets (see assetpack.py); loose files when missing
+
+LEVEL_CACHE_DIR = join(BASE_DIR, "cache", "levels")  # baked .lvl files (see baked_level.py)
+LEVEL_ATLAS = True     # bake only the tiles a level uses into its own atlas
+HOT_RELOAD = False     # dev: rebuild the running level's changed layers when its TMX/.tsx is saved
+
+PRELOAD = True         # prepare the next scenes in the background
+PRELOAD_BUDGET_MS = 3  # main-thread time per frame for converting preloaded images
+
+STREAMING = False      # build level chunks around the camera on a worker thread
+STREAM_CHUNK_TILES = 16
+STREAM_BUDGET = 24     # most chunks kept built at once
+STREAM_DIR = join(BASE_DIR, "cache", "chunks")
+
+CAPTURE = None         # None, "png" or "raw": record frames for QA
+CAPTURE_EVERY = 1      # keep every Nth frame
+CAPTURE_DIR = join(BASE_DIR, "captures")
@@ -1,13 +1,90 @@
+import weakref
 from settings import *
 
 class Sprite(pygame.sprite.Sprite):
+    static = True
+
     def __init__(self, pos, surf, groups):
         super().__init__(groups)
         self.image = surf
         self.rect = self.image.get_rect(topleft=pos)
 
 
+class TransformCache:
+    """
+    Transformed decoration surfaces shared between identical placements.
+
+    Keyed by source tile, flip flags, rotation and target size. For baked
+    levels the source tile is the gid's origin (tileset image, rect, flags
+    and colorkey), which survives a rebake renumbering the gids; otherwise map
+    file + gid. Objects without a gid are keyed by their source surface
+    itself, in `by_source`. Stats count since the last reset_stats(), i.e.
+    per level load.
+
+    Entries live as long as some sprite uses them, so evicted streaming
+    chunks and dropped scenes release their transformed images.
+    """
+
+    surfaces = weakref.WeakValueDictionary()
+    # source surface -> {placement key: transformed}; goes with its source
+    by_source = weakref.WeakKeyDictionary()
+    transforms = 0
+    transforms_saved = 0
+    bytes_saved = 0
+
+    @classmethod
+    def key(cls, obj):
+        origins = getattr(obj.parent, "origins", None)
+        if obj.gid and origins:
+            path, rect, flags, colorkey = origins[obj.gid]
+            source = (path, tuple(rect) if rect else None, tuple(flags), colorkey)
+        elif obj.gid:
+            source = (getattr(obj.parent, "filename", None), obj.gid)
+        else:
+            source = None   # the table in by_source already is per source
+        return (
+            source,
+            bool(getattr(obj, "flipped_horizontally", False)),
+            bool(getattr(obj, "flipped_vertically", False)),
+            obj.rotation,
+            (int(obj.width), int(obj.height)) if obj.width and obj.height else None
+        )
+
+    @classmethod
+    def get(cls, obj, transform):
+        key = cls.key(obj)
+        if obj.gid:
+            table = cls.surfaces
+        else:
+            table = cls.by_source.get(obj.image)
+            if table is None:
+                table = cls.by_source[obj.image] = weakref.WeakValueDictionary()
+        image = table.get(key)
+
+        if image is None:
+            image = table[key] = transform(obj)
+            cls.transforms += 1
+        else:
+            cls.transforms_saved += 1
+            cls.bytes_saved += image.get_pitch() * image.get_height()
+
+        return image
+
+    @classmethod
+    def reset_stats(cls):
+        cls.transforms = cls.transforms_saved = cls.bytes_saved = 0
+
+    @classmethod
+    def report(cls):
+        return (
+            f"decorations: {cls.transforms} transforms, "
+            f"{cls.transforms_saved} reused ({cls.bytes_saved // 1024} KiB saved)"
+        )
+
+
 class Decoration(pygame.sprite.Sprite):
+    static = True
+
     def __init__(self, pos, surf, groups):
         super().__init__(groups)
         self.image = surf
@@ -18,6 +95,11 @@ class Decoration(pygame.sprite.Sprite):
         if not obj.image:
             return None
 
+        image = TransformCache.get(obj, cls.transform)
+        return cls((obj.x, obj.y), image, groups)
+
+    @staticmethod
+    def transform(obj):
         image = obj.image
 
         if getattr(obj, "flipped_horizontally", False):
@@ -34,7 +116,7 @@ class Decoration(pygame.sprite.Sprite):
                 (int(obj.width), int(obj.height))
             )
 
-        return cls((obj.x, obj.y), image, groups)
+        return image
 class CollisionSprite(pygame.sprite.Sprite):
     def __init__(self, rect, groups):
         super().__init__(groups)
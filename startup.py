@@ -0,0 +1,140 @@
+import os
+import subprocess
+import sys
+
+from settings import *
+from flow import Flow
+
+# what main.py does up to its first frame; {scenes} / {warm} pick the mode.
+# The AI context is left out: it costs the same either way.
+FIRST_FRAME = """
+import time
+started = time.perf_counter()
+import pygame
+from types import SimpleNamespace
+from state_manager import StateManager
+from flow import Flow
+from preload import warm_start
+{scenes}
+pygame.init()
+screen = pygame.display.set_mode(({width}, {height}))
+warm_start([Flow.scene(name) for name in {warm}])
+context = SimpleNamespace(flags={{}}, metrics={{}}, behavior={{}})
+boot = Flow.scene("boot")(None, context)
+manager = StateManager(boot)
+boot.draw(screen)
+pygame.display.flip()
+print("FIRST_FRAME", (time.perf_counter() - started) * 1000)
+import sys
+print("SCENES", *sorted(name for name in sys.modules if name.startswith("scenes.")))
+"""
+
+# the scene imports main.py had before the registry
+EAGER_IMPORTS = "\n".join(
+    f"from {path.split(':')[0]} import {path.split(':')[1]}"
+    for path in (
+        "scenes.boot_scene:BootScene", "scenes.level1_scene:Level1Scene",
+        "scenes.level2_scene:Level2Scene", "scenes.level3_scene:Level3Scene",
+        "scenes.level4_scene:Level4Scene",
+    )
+)
+
+MODES = {
+    # the startup before the registry: every scene imported, level1 warmed too
+    "old": (EAGER_IMPORTS, ["boot", "level1"]),
+    # every scene imported, same warm set as lazy: isolates the imports
+    "eager": (EAGER_IMPORTS, ["boot"]),
+    # boot only; the rest is imported and prepared in the background
+    "lazy": ("", ["boot"]),
+}
+
+
+def run(code, *flags):
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get("SDL_VIDEODRIVER", "dummy"))
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+# =========================
+# IMPORT PROFILE
+# =========================
+def profile_imports(module, top=12):
+    """
+    [(cumulative ms, self ms, module)] for the slowest imports pulled in
+    by importing `module` in a fresh interpreter (python -X importtime).
+    """
+    rows = []
+    for line in run(f"import {module}", "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, int(own) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+# =========================
+# TIME TO FIRST FRAME
+# =========================
+def first_frame(mode):
+    """(ms to the first frame, scene modules imported by then) for one run."""
+    scenes, warm = MODES[mode]
+    code = FIRST_FRAME.format(scenes=scenes, warm=warm, width=WINDOW_WIDTH, height=WINDOW_HEIGHT)
+    lines = dict(line.split(" ", 1) for line in run(code).stdout.splitlines() if " " in line)
+    if "FIRST_FRAME" not in lines:
+        raise RuntimeError(f"{mode} startup printed no first frame")
+    return float(lines["FIRST_FRAME"]), set(lines.get("SCENES", "").split())
+
+
+def first_frame_ms(mode):
+    return first_frame(mode)[0]
+
+
+def benchmark(rounds=5, modes=MODES):
+    """Best-of-`rounds` ms to the first frame per mode, each in a fresh interpreter."""
+    for mode in modes:
+        first_frame_ms(mode)    # bake levels so no round pays for it
+    return {mode: min(first_frame_ms(mode) for _ in range(rounds)) for mode in modes}
+
+
+def check():
+    """
+    Startup regression check: with lazy scene imports, only the boot
+    scene is imported by the first frame (the rest is left to the
+    preloader). Checks what laziness changes rather than wall-clock time,
+    which varies too much between runs to assert on. Raises
+    AssertionError otherwise; returns the scene modules imported.
+    """
+    _, imported = first_frame("lazy")
+    expected = {Flow.SCENES["boot"].split(":")[0]}
+    assert imported == expected, (
+        f"scenes imported before the first frame: {', '.join(sorted(imported))} "
+        f"(expected only {', '.join(expected)})"
+    )
+    return imported
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--check"]:
+        try:
+            imported = check()
+        except AssertionError as e:
+            print(f"FAIL: {e}")
+            sys.exit(1)
+        print(f"ok: only {', '.join(imported)} imported before the first frame")
+        sys.exit(0)
+
+    for name, path in Flow.SCENES.items():
+        module = path.split(":")[0]
+        rows = profile_imports(module)
+        print(f"import {module}: {rows[0][0]:.0f} ms")
+        for cumulative, own, imported in rows[1:]:
+            print(f"    {cumulative:7.1f} ms  (self {own:5.1f})  {imported}")
+
+    results = benchmark()
+    print("time to first frame:")
+    for mode, ms in results.items():
+        print(f"    {mode:5}: {ms:6.1f} ms")
+    print(f"    lazy imports saved {results['eager'] - results['lazy']:.1f} ms")
+    print(f"    moving level1's warm-up to the preloader saved {results['old'] - results['eager']:.1f} ms")
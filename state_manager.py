@@ -1,9 +1,38 @@
+import pygame
+from assets import Assets
+from dirty import DirtyTracker
+from scene_pool import ScenePool
+from transition import Transition
+
+
 class StateManager:
     def __init__(self, initial_state):
         self.state = initial_state
+        self.dirty = DirtyTracker()
+        self.target = None   # RenderTarget when drawing the world at low res
+        self.backend = None  # TextureBackend when rendering through SDL2
+        self.effects = []    # post-process passes with apply(surface)
+        self.pool = ScenePool()
 
     def change_state(self, new_state):
+        old_state = self.state
+        if hasattr(old_state, "exit"):
+            old_state.exit()
+        Assets.release(old_state)
+        self.pool.put(old_state)
+
         self.state = new_state
+        if hasattr(new_state, "enter"):
+            new_state.enter()
+        self.dirty.invalidate()
+
+    def scene(self, scene_cls, context):
+        """A `scene_cls` to switch to: a pooled one reset, or a new one."""
+        return self.pool.get(scene_cls, self, context)
+
+    def transition(self, name, context, style="fade"):
+        """Animate to the Flow scene `name` (loaded in the background, see Transition)."""
+        self.change_state(Transition(self, name, context, style))
 
     def handle_event(self, event):
         self.state.handle_event(event)
@@ -11,5 +40,38 @@ class StateManager:
     def update(self, dt):
         self.state.update(dt)
 
+    def is_active(self):
+        """False when the current state has nothing animating (see FramePacer)."""
+        report = getattr(self.state, "is_active", None)
+        return bool(report()) if report else True
+
+    def snapshot(self):
+        """Copy of the current state's last frame (for transitions)."""
+        if self.backend:
+            return self.backend.snapshot(self.state)
+        return pygame.display.get_surface().copy()
+
     def draw(self, screen):
-        self.state.draw(screen)
+        if self.backend:
+            self.backend.draw(self.state)
+            return
+
+        # scenes that split world and UI can draw the world at low res;
+        # the UI is drawn after the upscale so text stays sharp
+        if self.target and hasattr(self.state, "draw_world"):
+            self.state.draw_world(self.target.surface, self.target.scale)
+            self.target.present(screen)
+            self.state.draw_ui(screen)
+        else:
+            self.state.draw(screen)
+
+        for effect in self.effects:
+            effect.apply(screen)
+
+    def dirty_rects(self):
+        """Screen rects changed by the last draw, or None for a full flip."""
+        # post-processing touches the whole frame
+        report = getattr(self.state, "dirty_rects", None)
+        if self.effects or not report:
+            return self.dirty.compose(None)
+        return self.dirty.compose(report())
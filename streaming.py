@@ -0,0 +1,330 @@
+import pygame
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from collections import deque
+from os.path import join, exists, basename, splitext
+from types import SimpleNamespace
+
+from settings import *
+from assets import Assets
+from sprite import Sprite, Decoration, CollisionSprite
+from quality import Quality
+
+
+BUILD_BUDGET_MS = 2  # main-thread chunk building per frame
+
+# =========================
+# BAKE
+# =========================
+def bake(level, directory, chunk_tiles=STREAM_CHUNK_TILES,
+         tile_layers=("Ground",), decorations="decorations", collision="platforms"):
+    """
+    Split a BakedLevel into per-chunk JSON files:
+
+        index.json      chunk size, source stamp, chunk keys
+        <cx>_<cy>.json  tiles and decorations whose top-left corner
+                        falls inside the chunk, plus every collision rect
+                        overlapping it
+    """
+    chunk_px = chunk_tiles * TILE_SIZE
+    chunks = {}
+
+    def chunk(x, y):
+        key = (int(x) // chunk_px, int(y) // chunk_px)
+        if key not in chunks:
+            chunks[key] = {"tiles": [], "decorations": [], "collision": []}
+        return chunks[key]
+
+    for name in tile_layers:
+        grid = level.grid(name)
+        ys, xs = np.nonzero(grid)
+        for x, y, gid in zip(xs.tolist(), ys.tolist(), grid[ys, xs].tolist()):
+            chunk(x * TILE_SIZE, y * TILE_SIZE)["tiles"].append(
+                [x * TILE_SIZE, y * TILE_SIZE, gid]
+            )
+
+    for obj in level.objects(decorations):
+        if obj.gid:
+            chunk(obj.x, obj.y)["decorations"].append(
+                [obj.id, obj.gid, obj.x, obj.y, obj.width, obj.height, obj.rotation]
+            )
+
+    for obj, rect in zip(level.objects(collision), level.rects(collision).tolist()):
+
+        # listed in every chunk it overlaps, shared by id once built
+        for cy in range(int(rect[1]) // chunk_px, int(rect[1] + rect[3]) // chunk_px + 1):
+            for cx in range(int(rect[0]) // chunk_px, int(rect[0] + rect[2]) // chunk_px + 1):
+                chunk(cx * chunk_px, cy * chunk_px)["collision"].append([obj.id] + rect)
+
+    os.makedirs(directory, exist_ok=True)
+    for (cx, cy), data in chunks.items():
+        with open(join(directory, f"{cx}_{cy}.json"), "w") as file:
+            json.dump(data, file)
+
+    index = {
+        "source": level.digest.hex(),
+        "chunk_tiles": chunk_tiles,
+        "chunks": [list(key) for key in chunks],
+    }
+    with open(join(directory, "index.json"), "w") as file:
+        json.dump(index, file)
+    return index
+
+
+def load_index(level, directory, chunk_tiles=STREAM_CHUNK_TILES):
+    """Chunk index for `level`, rebaking if its TMX changed."""
+    path = join(directory, "index.json")
+    if exists(path):
+        with open(path) as file:
+            index = json.load(file)
+        if (index["source"] == level.digest.hex()
+                and index["chunk_tiles"] == chunk_tiles):
+            return index
+
+    print(f"STREAM: baking {basename(level.filename)}")
+    return bake(level, directory, chunk_tiles)
+
+
+# =========================
+# STREAM
+# =========================
+class LevelStream:
+    """
+    Keeps only the chunks around the camera built.
+
+    A worker thread reads chunk files and decodes the tile images they
+    need that are not loaded yet. Everything that needs the display -
+    converting those images, cutting tiles, transforming decorations,
+    creating sprites - happens on the main thread in update(), a few
+    sprites at a time within BUILD_BUDGET_MS (as Staging.step does for
+    scenes). Finished chunks join the scene's groups; the furthest ones
+    are evicted when more than `budget` chunks are resident.
+
+    Collision is guaranteed: every frame the player's chunk and the ring
+    around it (a chunk is far wider than a frame's movement) must be
+    resident. Any that are not are read and built on the spot and
+    counted as stalls. Platforms spanning several chunks are listed in
+    each and shared, so they exist while any of those chunks is resident.
+
+    Memory: evicting a chunk drops its sprites, and with them the scaled
+    and rotated decoration images only that chunk used (TransformCache
+    holds them weakly). What stays is bounded by the tileset, not the map:
+    one cut image per tile gid, plus the baked level's arrays, which are
+    mapped from disk and paged in on demand.
+
+    A chunk the worker fails to read is reported and not requested again;
+    if the player reaches it, update() reads it on the main thread and
+    the error surfaces there.
+    """
+
+    def __init__(self, level, sprites, collision_sprites,
+                 budget=STREAM_BUDGET, margin=1, chunk_tiles=STREAM_CHUNK_TILES):
+        self.level = level
+        self.sprites = sprites
+        self.collision_sprites = collision_sprites
+        self.budget = budget
+        self.margin = margin
+
+        name = splitext(basename(level.filename))[0]
+        self.directory = join(STREAM_DIR, name)
+        index = load_index(level, self.directory, chunk_tiles)
+        self.chunk_px = index["chunk_tiles"] * TILE_SIZE
+        self.available = {tuple(key) for key in index["chunks"]}
+
+        # key -> (static sprites, collision ids)
+        self.resident = {}
+        # collision id -> [sprite, number of resident chunks listing it]
+        self.colliders = {}
+        self.queued = set()     # requested or read, not yet attached
+        self.failed = set()
+        self.ready = deque()    # (key, read chunk) waiting for the main thread
+        self.building = None    # build steps of the chunk in progress
+        self.requests = queue.SimpleQueue()
+        self.results = queue.SimpleQueue()
+
+        # stats
+        self.loaded = 0
+        self.evicted = 0
+        self.stalls = 0
+
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+
+    # =========================
+    # MAIN THREAD
+    # =========================
+    def chunks_around(self, rect, radius):
+        size = self.chunk_px
+        return {
+            (cx, cy)
+            for cy in range(int(rect.top) // size - radius, int(rect.bottom) // size + radius + 1)
+            for cx in range(int(rect.left) // size - radius, int(rect.right) // size + radius + 1)
+            if (cx, cy) in self.available
+        }
+
+    def update(self, player_rect, view):
+        """Call before the player moves. `view` is the camera rect in world space."""
+        self.integrate(time.perf_counter() + BUILD_BUDGET_MS / 1000)
+
+        required = self.chunks_around(player_rect, 1)
+        wanted = self.chunks_around(view, self.margin) | required
+
+        for key in required - self.resident.keys():
+            self.stalls += 1
+            for _ in self.build(key, self.read(key)):
+                pass
+
+        for key in wanted - self.resident.keys() - self.queued - self.failed:
+            self.queued.add(key)
+            self.requests.put(key)
+
+        if len(self.resident) > self.budget:
+            self.evict(wanted, player_rect)
+
+    def integrate(self, deadline):
+        """Build chunks the worker has read until `deadline` (perf_counter)."""
+        while True:
+            try:
+                key, read = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(read, Exception):
+                print(f"WARNING: Streaming chunk {key} failed: {read}")
+                self.queued.discard(key)
+                self.failed.add(key)
+            else:
+                self.ready.append((key, read))
+
+        while time.perf_counter() < deadline:
+            if self.building is None:
+                if not self.ready:
+                    return
+                self.building = self.build(*self.ready.popleft())
+            try:
+                next(self.building)
+            except StopIteration:
+                self.building = None
+
+    def attach(self, key, built):
+        static, collision = built
+        self.sprites.add(static)
+        for obj_id, rect in collision:
+            entry = self.colliders.get(obj_id)
+            if entry:
+                entry[1] += 1
+            else:
+                self.colliders[obj_id] = [CollisionSprite(rect, self.collision_sprites), 1]
+        self.resident[key] = (static, [obj_id for obj_id, _ in collision])
+        self.loaded += 1
+
+    def evict(self, keep, player_rect):
+        cx, cy = int(player_rect.centerx) // self.chunk_px, int(player_rect.centery) // self.chunk_px
+        candidates = sorted(
+            (key for key in self.resident if key not in keep),
+            key=lambda key: (key[0] - cx) ** 2 + (key[1] - cy) ** 2,
+            reverse=True
+        )
+        for key in candidates[:len(self.resident) - self.budget]:
+            self.detach(key)
+            self.evicted += 1
+
+    def detach(self, key):
+        static, collision = self.resident.pop(key)
+        self.sprites.remove(static)
+        for obj_id in collision:
+            entry = self.colliders[obj_id]
+            entry[1] -= 1
+            if not entry[1]:
+                entry[0].kill()
+                del self.colliders[obj_id]
+
+    def stop(self):
+        self.requests.put(None)
+
+    def clear(self):
+        """Stop and remove everything this stream added (before replacing it)."""
+        self.stop()
+        self.ready.clear()
+        self.building = None
+        for key in list(self.resident):
+            self.detach(key)
+
+    def summary(self):
+        return (
+            f"stream: {len(self.resident)}/{len(self.available)} chunks resident, "
+            f"{self.loaded} loaded, {self.evicted} evicted, {self.stalls} stalls, "
+            f"{len(self.failed)} failed"
+        )
+
+    # =========================
+    # BUILD (main thread)
+    # =========================
+    def build(self, key, read):
+        """Steps that build and attach a read chunk, one sprite per step."""
+        data, decoded = read
+        if key in self.resident:
+            self.queued.discard(key)
+            return
+
+        for path, surface in decoded.items():
+            Assets.adopt(path, True, surface)
+            yield
+
+        image = self.level.image
+        # keep the level's layering: decorations under tiles under the player
+        static = []
+        for x, y, gid in data["tiles"]:
+            sprite = Sprite((x, y), image(gid), ())
+            sprite.z = -1
+            static.append(sprite)
+            yield
+
+        for obj_id, gid, x, y, width, height, rotation in data["decorations"]:
+            obj = SimpleNamespace(
+                id=obj_id, gid=gid, image=image(gid), parent=self.level,
+                x=x, y=y, width=width, height=height, rotation=rotation
+            )
+            if Quality.keep_decoration(obj):
+                sprite = Decoration.from_tmx(obj, ())
+                sprite.z = -2
+                static.append(sprite)
+                yield
+
+        # a stall may have built this chunk meanwhile
+        self.queued.discard(key)
+        if key not in self.resident:
+            collision = [(obj_id, pygame.FRect(rect)) for obj_id, *rect in data["collision"]]
+            self.attach(key, (static, collision))
+
+    # =========================
+    # READ (either thread)
+    # =========================
+    def read(self, key):
+        """A chunk's data and the tile images it needs decoded, unconverted."""
+        with open(join(self.directory, f"{key[0]}_{key[1]}.json")) as file:
+            data = json.load(file)
+
+        sources = self.level.tile_sources
+        gids = {gid for _, _, gid in data["tiles"]}
+        gids.update(entry[1] for entry in data["decorations"])
+        paths = {sources[gid][0] for gid in gids if sources[gid]}
+        decoded = {path: Assets.decode(path) for path in paths if not Assets.has(path, True)}
+        return data, decoded
+
+    # =========================
+    # WORKER THREAD
+    # =========================
+    def _work(self):
+        while True:
+            key = self.requests.get()
+            if key is None:
+                return
+            try:
+                self.results.put((key, self.read(key)))
+            except Exception as e:
+                # reported on the main thread; the worker keeps serving
+                self.results.put((key, e))
@@ -0,0 +1,34 @@
+import statistics
+import time
+
+import pygame
+
+from settings import *
+from glitch import GlitchEffect
+
+# a quarter of a 60 FPS frame for the whole post-process
+BUDGET_MS = 1000 / 60 / 4
+
+
+def test_glitch_fits_frame_budget(screen):
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    surface.fill((30, 60, 90))
+    effect = GlitchEffect(surface.get_size(), seed=0)
+    effect.apply(surface, 1.0)      # first call packs the noise table
+
+    timings = []
+    for _ in range(30):
+        start = time.perf_counter()
+        effect.apply(surface, 1.0)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    assert statistics.median(timings) < BUDGET_MS
+
+
+def test_glitch_changes_pixels(screen):
+    surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    surface.fill((30, 60, 90))
+    before = pygame.image.tobytes(surface, "RGB")
+
+    GlitchEffect(surface.get_size(), seed=0).apply(surface, 1.0)
+    assert pygame.image.tobytes(surface, "RGB") != before
@@ -0,0 +1,5 @@
+import startup
+
+
+def test_only_boot_scene_imported_before_first_frame():
+    assert startup.check() == {"scenes.boot_scene"}
@@ -0,0 +1,27 @@
+import pygame
+
+from settings import *
+from camera import CameraGroup
+from sprite import Sprite
+from texture_backend import TextureBackend
+
+TILE_COLOR = (40, 80, 40)
+
+
+def test_software_renderer_draws_camera_group(screen):
+    backend = TextureBackend((WINDOW_WIDTH, WINDOW_HEIGHT), accelerated=0)
+
+    tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+    tile.fill(TILE_COLOR)
+    group = CameraGroup()
+    for x in range(4):
+        Sprite((x * TILE_SIZE, 0), tile, group)
+
+    backend.renderer.draw_color = (0, 0, 0, 255)
+    backend.renderer.clear()
+    group.draw(backend.canvas)
+    frame = backend.renderer.to_surface()
+
+    assert frame.get_at((TILE_SIZE // 2, TILE_SIZE // 2))[:3] == TILE_COLOR
+    assert frame.get_at((4 * TILE_SIZE + 1, TILE_SIZE // 2))[:3] == (0, 0, 0)
+    assert backend.canvas.uploads
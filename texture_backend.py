@@ -0,0 +1,146 @@
+import pygame
+import weakref
+from pygame._sdl2.video import Window, Renderer, Texture
+from settings import *
+
+
+class TextureCanvas:
+    """
+    Stands in for a Surface so scenes and CameraGroup can draw through the
+    SDL2 renderer unchanged: blit/fblits become textured draws.
+
+    Each source surface is uploaded once, so it must not be drawn on
+    afterwards (tiles, baked chunks, animation frames, backgrounds).
+    """
+
+    # CameraGroup bakes static sprites into chunk surfaces for us
+    bake_static = True
+
+    def __init__(self, renderer, size):
+        self.renderer = renderer
+        self.size = size
+        self.textures = weakref.WeakKeyDictionary()
+        self.uploads = 0
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def texture(self, surface):
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.textures[surface] = Texture.from_surface(self.renderer, surface)
+            self.uploads += 1
+        return texture
+
+    def blit(self, surface, dest):
+        self.texture(surface).draw(dstrect=dest)
+
+    def fblits(self, blit_sequence):
+        for surface, dest in blit_sequence:
+            self.texture(surface).draw(dstrect=dest)
+
+
+class TextureBackend:
+    """
+    Render backend built on pygame._sdl2.video.
+
+    Scenes with draw_world/draw_ui draw the world through a TextureCanvas
+    and the UI into an overlay that is uploaded each frame. Any other state
+    (BootScene, Transition, ...) draws onto a plain Surface that is
+    streamed to the renderer as one texture.
+
+    `accelerated=0` forces SDL's software renderer (headless runs).
+    """
+
+    def __init__(self, size=(WINDOW_WIDTH, WINDOW_HEIGHT), accelerated=-1):
+        self.window = Window("PROTOCOL", size=size)
+        self.renderer = Renderer(self.window, accelerated=accelerated)
+        self.canvas = TextureCanvas(self.renderer, size)
+
+        # surface-only states
+        self.frame = pygame.Surface(size).convert()
+        self.frame_texture = Texture(self.renderer, size, streaming=True)
+
+        # UI drawn on top of the textured world
+        self.overlay = pygame.Surface(size, pygame.SRCALPHA)
+        self.overlay_texture = Texture(self.renderer, size, streaming=True)
+        self.overlay_texture.blend_mode = pygame.BLENDMODE_BLEND
+
+    def draw(self, state):
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+
+        if hasattr(state, "draw_world"):
+            state.draw_world(self.canvas)
+
+            self.overlay.fill((0, 0, 0, 0))
+            state.draw_ui(self.overlay)
+            self.overlay_texture.update(self.overlay)
+            self.overlay_texture.draw()
+        else:
+            state.draw(self.frame)
+            self.frame_texture.update(self.frame)
+            self.frame_texture.draw()
+
+    def present(self):
+        self.renderer.present()
+
+    def snapshot(self, state):
+        """Render `state` once and read the frame back as a Surface."""
+        self.draw(state)
+        return self.renderer.to_surface()
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(frames=300):
+    """Time the same tiled world + player on the Surface and SDL2 paths."""
+    import time
+    from camera import CameraGroup
+    from sprite import Sprite
+    from player import AnimationBank
+
+    size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+    tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+    tile.fill((40, 80, 40))
+
+    group = CameraGroup()
+    for x in range(40):
+        for y in range(24):
+            Sprite((x * TILE_SIZE, y * TILE_SIZE), tile, group)
+    hero = pygame.sprite.Sprite(group)
+    hero.image = AnimationBank.get("idle-right")[0]
+    hero.rect = hero.image.get_rect(center=size)
+
+    surface = pygame.Surface(size).convert()
+    backend = TextureBackend(size, accelerated=0)
+
+    results = {}
+    start = time.perf_counter()
+    for i in range(frames):
+        group.draw(surface, (i % TILE_SIZE, 0))
+    results["surface"] = (time.perf_counter() - start) / frames * 1000
+
+    start = time.perf_counter()
+    for i in range(frames):
+        backend.renderer.clear()
+        group.draw(backend.canvas, (i % TILE_SIZE, 0))
+        backend.present()
+    results["sdl2"] = (time.perf_counter() - start) / frames * 1000
+
+    return results
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    for name, ms in benchmark().items():
+        print(f"{name}: {ms:.2f} ms/frame")
@@ -0,0 +1,123 @@
+import pygame
+import threading
+import time
+from settings import *
+from flow import Flow
+from preload import Staging
+
+# FADE_SPEED is alpha per frame at 60 FPS
+FADE_TIME = 255 / (FADE_SPEED * 60)
+BUILD_BUDGET_MS = 8  # main-thread loading per frame while the snapshot shows
+
+
+class Transition:
+    """
+    Temporary state that sits between two scenes.
+
+    The outgoing frame is copied once and the old scene is no longer
+    updated or drawn. While the snapshot animates, a worker thread
+    imports the next scene and does its display-free loading (decoding,
+    level baking/mapping, see Staging); the display work that leaves -
+    converting surfaces, cutting tiles - runs on the main thread a
+    slice per frame. Once it is done the scene itself (sprites, fonts,
+    UI) is built or reset on the main thread and handed to the manager.
+
+    styles:
+        "fade"       snapshot fades to black, new scene fades in
+        "crossfade"  snapshot dissolves straight into the new scene
+    """
+
+    def __init__(self, manager, name, context, style="fade"):
+        self.manager = manager
+        self.context = context
+        self.style = style
+
+        self.snapshot = manager.snapshot()
+        self.phase = "out" if style == "fade" else "wait"
+        self.progress = 0.0
+
+        # load the next scene in the background
+        self.scene_cls = None
+        self.scene = None
+        self.error = None
+        self.staging = Staging()
+        self.loader = threading.Thread(target=self._load, args=(name,), daemon=True)
+        self.loader.start()
+
+    def _load(self, name):
+        try:
+            self.scene_cls = Flow.scene(name)
+        except Exception as e:
+            self.error = e
+            return
+        try:
+            self.staging.prepare(self.scene_cls)
+        except Exception as e:
+            # the scene will simply load everything itself
+            print(f"WARNING: Preparing {name} failed: {e}")
+
+    def advance(self):
+        """Main-thread share of loading, within this frame's budget."""
+        if self.error:
+            raise self.error
+        if self.scene or self.loader.is_alive():
+            return
+        deadline = time.perf_counter() + BUILD_BUDGET_MS / 1000
+        if self.staging.step(deadline):
+            self.scene = self.manager.scene(self.scene_cls, self.context)
+
+    @property
+    def ready(self):
+        return self.scene is not None
+
+    # =========================
+    # INPUT
+    # =========================
+    def handle_event(self, event):
+        # nothing is interactive mid-transition
+        pass
+
+    # =========================
+    # UPDATE
+    # =========================
+    def update(self, dt):
+        self.progress = min(1.0, self.progress + dt / FADE_TIME)
+        self.advance()
+
+        if self.phase == "out":
+            if self.progress >= 1 and self.ready:
+                self.phase, self.progress = "in", 0.0
+
+        elif self.phase == "wait":
+            # crossfade needs the new scene to blend into
+            self.progress = 0.0
+            if self.ready:
+                self.phase = "in"
+
+        else:
+            self.scene.update(dt)
+            if self.progress >= 1:
+                self.manager.change_state(self.scene)
+
+    # =========================
+    # DRAW
+    # =========================
+    def draw(self, screen):
+        if self.phase == "in":
+            self.scene.draw(screen)
+            if self.style == "fade":
+                self.darken(screen, self.progress)
+            else:
+                self.snapshot.set_alpha(int(255 * (1 - self.progress)))
+                screen.blit(self.snapshot, (0, 0))
+            return
+
+        screen.blit(self.snapshot, (0, 0))
+        if self.phase == "out":
+            self.darken(screen, 1 - self.progress)
+
+    def darken(self, screen, brightness):
+        """Scale the frame towards black in place (no overlay surface)."""
+        level = int(255 * brightness)
+        if level < 255:
+            screen.fill((level, level, level), special_flags=pygame.BLEND_RGB_MULT)
@@ -13,6 +13,14 @@ class DialogueBox:
         self.last_time = pygame.time.get_ticks()
         self.finished_line = False
 
+        self.rect = pygame.Rect(60, 520, 1160, 140)
+        # region changed by the last draw (None = unchanged)
+        self.dirty_rect = None
+        self.drawn = None
+
+    def is_typing(self):
+        return self.visible and not self.finished_line
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
             if not self.finished_line:
@@ -42,7 +50,13 @@ class DialogueBox:
                 self.finished_line = True
 
     def draw(self, screen):
-        box = pygame.Rect(60, 520, 1160, 140)
+        drawn = (self.visible, self.text)
+        self.dirty_rect = self.rect if drawn != self.drawn else None
+        self.drawn = drawn
+        if not self.visible:
+            return
+
+        box = self.rect
         pygame.draw.rect(screen, (10, 10, 10), box)
         pygame.draw.rect(screen, (80, 255, 120), box, 2)
 